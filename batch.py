@@ -0,0 +1,165 @@
+import re
+import ast
+import json
+import time
+import asyncio
+import argparse
+import importlib
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+from crawlcore import trace
+
+SOURCES = ["okky", "itunion", "careerly"]
+
+def parse_day(s: str) -> date:
+    s = s.strip().replace(".", "-").replace("/", "-")
+    if re.fullmatch(r"\d{8}", s):
+        return datetime.strptime(s, "%Y%m%d").date()
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+def parse_window(s: str) -> tuple[date, date]:
+    a, b = re.split(r"\s*[~:]\s*", s.strip(), maxsplit=1)
+    start, end = parse_day(a), parse_day(b)
+    return (start, end) if start <= end else (end, start)
+
+def split_range(start: date, end: date, step: str) -> list:
+    out = []
+    cur = start
+    while cur <= end:
+        if step == "month":
+            nxt = (cur.replace(day=1) + timedelta(days=32)).replace(day=1)
+        else:
+            nxt = cur + timedelta(days=int(step))
+        out.append((cur, min(nxt - timedelta(days=1), end)))
+        cur = nxt
+    return out
+
+def load_config(path: Path) -> dict:
+    cfg = json.loads(path.read_text(encoding="utf-8"))
+    windows = [parse_window(w) if isinstance(w, str) else (parse_day(w[0]), parse_day(w[1]))
+               for w in cfg.get("windows", [])]
+    if cfg.get("range"):
+        start, end = parse_window(cfg["range"])
+        windows += split_range(start, end, str(cfg.get("step", "month")))
+    return {"sources": cfg.get("sources") or SOURCES, "windows": windows, "set": cfg.get("set") or {}}
+
+def apply(overrides: dict):
+    for target, value in overrides.items():
+        mod_name, attr = target.rsplit(".", 1)
+        if isinstance(value, str):
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                pass
+        setattr(importlib.import_module(mod_name), attr, value)
+
+async def run_okky(windows: list) -> list:
+    import okky
+
+    out = []
+    async with okky.make_engine() as eng:
+        for start, end in windows:
+            okky.START_DATE, okky.END_DATE = start, end
+            out.append(await window("okky", okky, start, end, okky.crawl_window()))
+        print(eng.rate_report())
+    return out
+
+async def run_itunion(windows: list) -> list:
+    import itunion
+
+    itunion.USE_DATE_RANGE = True
+    out = []
+    async with itunion.make_engine() as eng:
+        for start, end in windows:
+            itunion.START_DATE, itunion.END_DATE = start, end
+            out.append(await window("itunion", itunion, start, end, itunion.crawl_window()))
+        print(eng.rate_report())
+    return out
+
+async def run_careerly(windows: list) -> list:
+    import careerly
+
+    out = []
+    async with careerly.make_engine(careerly.load_cookies()) as eng:
+        await careerly.ensure_session()
+        for start, end in windows:
+            ds = datetime.combine(start, datetime.min.time())
+            de = datetime.combine(end, datetime.min.time())
+            out.append(await window("careerly", careerly, start, end, careerly.crawl_window(ds, de)))
+            careerly.save_cookies(careerly.dump_cookies())
+        print(eng.rate_report())
+    return out
+
+RUNNERS = {"okky": run_okky, "itunion": run_itunion, "careerly": run_careerly}
+
+async def window(name: str, mod, start: date, end: date, job) -> dict:
+    print(f"[batch] {name} {start} ~ {end} 시작")
+    t0 = time.time()
+    try:
+        n = await job
+    except Exception as e:
+        print(f"[batch] {name} {start} ~ {end} 실패: {e!r}")
+        mod._marks.hold()
+        return {"source": name, "start": start, "end": end, "count": None, "sec": time.time() - t0, "error": repr(e),
+                "held": mod._marks.held_keys()}
+    mod._marks.save()
+    return {"source": name, "start": start, "end": end, "count": n, "sec": time.time() - t0, "error": None,
+            "held": mod._marks.held_keys()}
+
+async def run(sources: list, windows: list) -> list:
+    results = await asyncio.gather(*(RUNNERS[s](windows) for s in sources), return_exceptions=True)
+    rows = []
+    for s, r in zip(sources, results):
+        if isinstance(r, BaseException):
+            print(f"[batch] {s} 중단: {r!r}")
+            rows += [{"source": s, "start": a, "end": b, "count": None, "sec": 0.0, "error": repr(r)} for a, b in windows]
+        else:
+            rows += r
+    return rows
+
+def summary(rows: list):
+    print("=" * 60)
+    for r in rows:
+        n = "실패" if r["error"] else f"{r['count']}건"
+        held = f"  기준점 유지: {', '.join(r['held'])}" if r.get("held") else ""
+        print(f"{r['source']:9s} {r['start']} ~ {r['end']}  {n:>8s}  {r['sec']:.1f}s{held}")
+    print("=" * 60)
+
+def main():
+    ap = argparse.ArgumentParser(description="여러 기간/소스를 한 프로세스에서 연속 수집")
+    ap.add_argument("sources", nargs="*", help=f"{', '.join(SOURCES)} (기본: 전체)")
+    ap.add_argument("--window", action="append", default=[], help="YYYY-MM-DD~YYYY-MM-DD (여러 번 지정 가능)")
+    ap.add_argument("--range", help="YYYY-MM-DD~YYYY-MM-DD 를 --step 단위로 분할")
+    ap.add_argument("--step", default="month", help="month 또는 일수 (기본 month)")
+    ap.add_argument("--config", type=Path, help='JSON: {"sources": [...], "windows": [...], "range": "...", "step": 7, "set": {...}}')
+    ap.add_argument("--set", nargs="*", default=[], metavar="MODULE.NAME=VALUE")
+    ap.add_argument("--profile", action="store_true", help="단계별 trace/CPU 프로파일 저장 (./.crawl_profile)")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config) if args.config else {"sources": SOURCES, "windows": [], "set": {}}
+    sources = args.sources or cfg["sources"]
+    unknown = [s for s in sources if s not in SOURCES]
+    if unknown:
+        ap.error(f"알 수 없는 소스: {', '.join(unknown)}")
+    windows = cfg["windows"] + [parse_window(w) for w in args.window]
+    if args.range:
+        windows += split_range(*parse_window(args.range), args.step)
+    if not windows:
+        ap.error("--window, --range 또는 --config 로 기간을 지정하세요")
+
+    apply({**cfg["set"], **dict(o.split("=", 1) for o in args.set)})
+
+    print(f"[batch] 소스={','.join(sources)} 기간 {len(windows)}개")
+    t0 = time.time()
+    if args.profile:
+        trace.start("batch")
+    try:
+        rows = asyncio.run(run(sources, windows))
+    finally:
+        trace.stop()
+    summary(rows)
+    print("elapsed_min:", round((time.time() - t0) / 60, 2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import ast
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import importlib
+import multiprocessing as mp
+from pathlib import Path
+from typing import Optional
+from datetime import datetime, timedelta
+
+from bench import standin
+from crawlcore import metrics, neardup, ratelimit, trace
+from crawlcore.watermark import Watermarks
+
+SITES = ["okky", "careerly", "itunion"]
+
+def percentile(xs: list, q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+class Probe:
+    def __init__(self):
+        self.started = {}
+        self.latency = []
+        self.status = {}
+        self.bytes = 0
+
+    async def on_request(self, request):
+        self.started[id(request)] = time.perf_counter()
+
+    async def on_response(self, response):
+        t0 = self.started.pop(id(response.request), None)
+        if t0 is not None:
+            self.latency.append(time.perf_counter() - t0)
+        self.status[response.status_code] = self.status.get(response.status_code, 0) + 1
+        self.bytes += int(response.headers.get("Content-Length") or 0)
+
+    def attach(self, eng):
+        for h in eng.hosts.values():
+            h.client.event_hooks["request"].append(self.on_request)
+            h.client.event_hooks["response"].append(self.on_response)
+        return eng
+
+def point(name: str, mod, netloc: str, start, end, work: Path):
+    if name == "okky":
+        mod.OKKY_HOST = netloc
+        mod.OKKY_BASE = f"http://{netloc}/okky"
+        mod.API_BASE = f"{mod.OKKY_BASE}/api/okky-web"
+        mod.START_DATE, mod.END_DATE = start, end
+        mod._build_id = None
+    elif name == "careerly":
+        mod.API_HOST = netloc
+        mod.API_BASE = f"http://{netloc}/careerly/api/v1"
+    elif name == "itunion":
+        mod.HOST = netloc
+        mod.BASE_URL = f"http://{netloc}/itunion/xe/index.php"
+        mod.USE_DATE_RANGE = True
+        mod.START_DATE, mod.END_DATE = start, end
+    if hasattr(mod, "HTTP_CACHE"):
+        mod.HTTP_CACHE = False
+    if hasattr(mod, "COOKIE_FILE"):
+        mod.COOKIE_FILE = work / "cookies.json"
+
+async def drive(name: str, mod, start, end):
+    if name == "careerly":
+        await mod.run([{"name": "standin", "value": "1"}], datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()))
+    else:
+        await mod.run()
+
+def apply(overrides: list):
+    for o in overrides:
+        target, value = o.split("=", 1)
+        mod_name, attr = target.rsplit(".", 1)
+        mod = importlib.import_module(mod_name)
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        setattr(mod, attr, value)
+
+def run_site(name: str, netloc: str, days: int, work: Path, profile: Optional[Path] = None) -> dict:
+    mod = importlib.import_module(name)
+    end = standin.NEWEST.date()
+    start = end - timedelta(days=days - 1)
+    work.mkdir(parents=True, exist_ok=True)
+    point(name, mod, netloc, start, end, work)
+    mod.OUTPUT_DIR = work
+    mod.CHECKPOINT_DIR = work / "checkpoint"
+    mod._marks = Watermarks(name, enabled=False, state_dir=work / "state")
+    neardup.INDEX_PATH = work / "state" / "neardup.npz"
+    ratelimit.RATE_DIR = work / "state" / "rate"
+    metrics.METRICS_DIR = work / "metrics"
+
+    probe = Probe()
+    sinks = []
+    make_engine, open_sink = mod.make_engine, mod.open_sink
+    mod.make_engine = lambda *a: probe.attach(make_engine(*a))
+    mod.open_sink = lambda *a: sinks.append(open_sink(*a)) or sinks[-1]
+
+    if profile is not None:
+        trace.start(name, root=profile)
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    try:
+        asyncio.run(drive(name, mod, start, end))
+    finally:
+        mod.make_engine, mod.open_sink = make_engine, open_sink
+        trace.stop()
+    wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+
+    records = sum(s.count for s in sinks)
+    return {
+        "site": name,
+        "records": records,
+        "requests": len(probe.latency),
+        "wall_sec": round(wall, 3),
+        "records_per_sec": round(records / wall, 2) if wall else 0,
+        "p50_ms": round(percentile(probe.latency, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(probe.latency, 0.99) * 1000, 1),
+        "cpu_ms_per_record": round(cpu * 1000 / records, 3) if records else None,
+        "status": {str(k): v for k, v in sorted(probe.status.items())},
+        "mb": round(probe.bytes / 1024 ** 2, 2),
+    }
+
+def report(rows: list):
+    print()
+    print(f"{'site':9s} {'records':>8s} {'req':>6s} {'wall':>8s} {'rec/s':>8s} {'p50ms':>7s} {'p99ms':>7s} {'cpu/rec':>8s}  status")
+    for r in rows:
+        cpu = f"{r['cpu_ms_per_record']:.3f}" if r["cpu_ms_per_record"] is not None else "-"
+        print(
+            f"{r['site']:9s} {r['records']:8d} {r['requests']:6d} {r['wall_sec']:8.2f} {r['records_per_sec']:8.2f} "
+            f"{r['p50_ms']:7.1f} {r['p99_ms']:7.1f} {cpu:>8s}  {r['status']}"
+        )
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sites", nargs="*", default=SITES, choices=SITES)
+    for k, v in standin.DEFAULTS.items():
+        ap.add_argument(f"--{k.replace('_', '-')}", type=type(v) if v is not None else str, default=v)
+    ap.add_argument("--set", nargs="*", default=[], metavar="MODULE.NAME=VALUE",
+                    help="예: okky.DETAIL_WORKERS=20 itunion.MAX_QPS=30")
+    ap.add_argument("--json", type=Path, help="결과 JSON 저장 경로")
+    ap.add_argument("--profile", type=Path, metavar="DIR", help="사이트별 trace/CPU 프로파일 저장 폴더")
+    args = ap.parse_args()
+
+    cfg = {k: getattr(args, k) for k in standin.DEFAULTS}
+    ready = mp.Queue()
+    server = mp.Process(target=standin.serve, args=(cfg, 0, ready), daemon=True)
+    server.start()
+    netloc = f"127.0.0.1:{ready.get(timeout=10)}"
+    print(f"stand-in 서버: {netloc} {cfg}")
+
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            apply(args.set)
+            for name in args.sites:
+                print(f"\n=== {name} ===")
+                rows.append(run_site(name, netloc, cfg["days"], Path(tmp) / name, args.profile))
+    finally:
+        server.terminate()
+
+    report(rows)
+    if args.json:
+        args.json.write_text(json.dumps({"config": cfg, "set": args.set, "results": rows}, ensure_ascii=False, indent=1),
+                             encoding="utf-8")
+        print("저장:", args.json)
+
+if __name__ == "__main__":
+    main()
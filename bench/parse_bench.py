@@ -0,0 +1,141 @@
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import itunion
+import okky
+import careerly
+from crawlcore import htmlparse as hp
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+ROUNDS = 50
+BACKENDS = ["html.parser", "lxml"]
+IGNORE = {"crawled_at", "content_html"}
+
+RECORD_LIST_PAGES = 2
+RECORD_DETAILS = 5
+RECORD_POSTS_PAGES = 2
+
+def strip(v):
+    if isinstance(v, dict):
+        return {k: x for k, x in v.items() if k not in IGNORE}
+    if isinstance(v, tuple):
+        return tuple(strip(x) for x in v)
+    if isinstance(v, list):
+        return [strip(x) for x in v]
+    return v
+
+def okky_ref(html):
+    tag = hp.soup(html).find("script", id="__NEXT_DATA__")
+    if not (tag and tag.string):
+        return ""
+    return okky.extract_detail(json.loads(tag.string), "")
+
+def careerly_posts(body):
+    careerly._marks.begin(False)
+    out, _ = careerly.parse_posts(json.loads(body), None, None)
+    for r in out:
+        if "_html" in r:
+            r["description"] = hp.html_text(r.pop("_html"))
+    return out
+
+PARSERS = {
+    "itunion_list": (itunion.parse_list, itunion.parse_list),
+    "itunion_detail": (itunion.parse_detail, itunion.parse_detail),
+    "okky_article": (okky_ref, lambda html: okky.parse_detail_html(html, "")),
+    "careerly_posts": (careerly_posts, careerly_posts),
+}
+
+def kind_of(p: Path) -> str:
+    return p.stem.rsplit("_", 1)[0]
+
+def load() -> list:
+    pages = []
+    for p in sorted(CORPUS_DIR.glob("*.*")):
+        if p.suffix in (".html", ".json") and kind_of(p) in PARSERS:
+            pages.append((p, p.read_text(encoding="utf-8")))
+    return pages
+
+def run(backend: str, kind: str, html: str):
+    hp.PARSER = backend
+    ref, fast = PARSERS[kind]
+    return (ref if backend == "html.parser" else fast)(html)
+
+def check(pages: list) -> int:
+    bad = 0
+    for p, html in pages:
+        want = strip(run(BACKENDS[0], kind_of(p), html))
+        for b in BACKENDS[1:]:
+            got = strip(run(b, kind_of(p), html))
+            if got != want:
+                bad += 1
+                print(f"[불일치] {p.name} ({b})")
+                print("  기준:", json.dumps(want, ensure_ascii=False)[:400])
+                print("  결과:", json.dumps(got, ensure_ascii=False)[:400])
+    return bad
+
+def bench(pages: list, rounds: int):
+    size = sum(len(h.encode("utf-8")) for _, h in pages)
+    base = None
+    for b in BACKENDS:
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for p, html in pages:
+                run(b, kind_of(p), html)
+        sec = time.perf_counter() - t0
+        n = rounds * len(pages)
+        base = base or sec
+        print(f"{b:12s} {n / sec:9.1f} pages/s {size * rounds / sec / 1024 ** 2:7.2f} MB/s  x{base / sec:.1f}")
+
+def save(kind: str, i: int, html: str, ext: str = "html"):
+    out = CORPUS_DIR / f"{kind}_live{i:02d}.{ext}"
+    out.write_text(html, encoding="utf-8")
+    print("저장:", out)
+
+def record(okky_ids: list, posts_pages: int):
+    import httpx
+
+    CORPUS_DIR.mkdir(parents=True, exist_ok=True)
+    hp.PARSER = "html.parser"
+    details = []
+    with httpx.Client(headers=itunion.HEADERS, timeout=20, follow_redirects=True) as c:
+        for p in range(1, RECORD_LIST_PAGES + 1):
+            html = c.get(f"{itunion.BASE_URL}?mid={itunion.MID}&page={p}").text
+            save("itunion_list", p, html)
+            details += [r["url"] for r in itunion.parse_list(html)[1]]
+        for i, u in enumerate(details[:RECORD_DETAILS], 1):
+            save("itunion_detail", i, c.get(u).text)
+    with httpx.Client(headers=okky.HEADERS, timeout=20, follow_redirects=True) as c:
+        for i, aid in enumerate(okky_ids, 1):
+            save("okky_article", i, c.get(f"{okky.OKKY_BASE}/articles/{aid}").text)
+    cookies = {c["name"]: c["value"] for c in careerly.load_cookies()}
+    with httpx.Client(headers=careerly.HEADERS, cookies=cookies, timeout=20, follow_redirects=True) as c:
+        for p in range(1, posts_pages + 1):
+            r = c.get(f"{careerly.API_BASE}/posts/?exclude_following=true&page={p}")
+            r.raise_for_status()
+            save("careerly_posts", p, r.text, "json")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=ROUNDS)
+    ap.add_argument("--record", action="store_true")
+    ap.add_argument("--okky", nargs="*", default=[], help="기록할 OKKY 글 번호")
+    ap.add_argument("--careerly", type=int, default=RECORD_POSTS_PAGES, help="기록할 careerly posts 페이지 수 (저장된 쿠키 사용)")
+    args = ap.parse_args()
+
+    if args.record:
+        record(args.okky, args.careerly)
+
+    pages = load()
+    print(f"코퍼스: {len(pages)}개 ({CORPUS_DIR})")
+    bad = check(pages)
+    if bad:
+        print(f"출력 불일치 {bad}건")
+        sys.exit(1)
+    print("출력 일치")
+    bench(pages, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import gzip
+import json
+import zlib
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotlicffi as brotli
+except ImportError:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+NEWEST = datetime(2026, 3, 31, 18, 0)
+BUILD_ID = "standin"
+
+WORDS = (
+    "신입 개발자 이직 연봉 협상 면접 질문 백엔드 프론트엔드 자바 스프링 파이썬 코딩테스트 포트폴리오 "
+    "SI 회사 야근 퇴사 계약직 정규직 경력 기술스택 리액트 데이터 분석 클라우드 AWS 도커 노조 근로계약서"
+).split()
+
+DEFAULTS = {
+    "latency": 0.05,
+    "jitter": 0.02,
+    "p429": 0.0,
+    "p5xx": 0.0,
+    "retry_after": 1,
+    "pages": 3,
+    "page_size": 20,
+    "days": 30,
+    "fixtures": None,
+    "compress": 1,
+}
+
+class Board:
+    def __init__(self, pages: int, size: int, days: int, base_id: int):
+        self.pages = pages
+        self.size = size
+        self.total = pages * size
+        self.step = days * 86400 / max(self.total, 1)
+        self.base_id = base_id
+
+    def ids(self, page: int) -> list:
+        lo = page * self.size
+        return [self.base_id - i for i in range(lo, min(lo + self.size, self.total))]
+
+    def when(self, item_id: int) -> datetime:
+        return NEWEST - timedelta(seconds=(self.base_id - item_id) * self.step)
+
+def words(rnd: random.Random, n: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+def body_html(item_id: int) -> str:
+    rnd = random.Random(item_id)
+    paras = "".join(f"<p>{words(rnd, rnd.randint(8, 40))}</p>" for _ in range(rnd.randint(3, 12)))
+    return f'{paras}<script>var x = 1;</script><div class="ads">광고</div><p>{words(rnd, 5)} &amp; 끝</p>'
+
+class Sites:
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        pages, size, days = cfg["pages"], cfg["page_size"], cfg["days"]
+        self.okky = {}
+        self.lock = threading.Lock()
+        self.questions = Board(pages, size, days, 90_000)
+        self.posts = Board(pages, size, days, 190_000)
+        self.itunion = Board(pages, size, days, 2_700_000)
+
+    def okky_board(self, code: str) -> Board:
+        with self.lock:
+            if code not in self.okky:
+                c = self.cfg
+                base = 1_000_000 + (zlib.crc32(code.encode()) % 9973 + 1) * c["pages"] * c["page_size"]
+                self.okky[code] = Board(c["pages"], c["page_size"], c["days"], base)
+            return self.okky[code]
+
+    def okky_list(self, code: str, page: int) -> dict:
+        b = self.okky_board(code)
+        content = []
+        for aid in b.ids(page):
+            rnd = random.Random(aid)
+            content.append({
+                "id": aid,
+                "title": words(rnd, 6),
+                "dateCreated": b.when(aid).isoformat(),
+                "category": {"defaultLabel": code},
+                "displayAuthor": {"nickname": f"user{aid % 997}"},
+                "viewCount": rnd.randint(1, 9999),
+                "assentCount": rnd.randint(0, 50),
+                "dissentCount": rnd.randint(0, 5),
+                "noteCount": rnd.randint(0, 30),
+            })
+        return {"content": content, "totalPages": b.pages, "number": page}
+
+    def okky_detail(self, aid: int) -> dict:
+        return {"pageProps": {"result": {"id": aid, "content": {"text": body_html(aid)}}}}
+
+    def okky_page(self, aid: int) -> str:
+        data = json.dumps({"props": self.okky_detail(aid), "buildId": BUILD_ID}, ensure_ascii=False).replace("<", "\\u003c")
+        return f'<html><body><div id="__next"></div><script id="__NEXT_DATA__" type="application/json">{data}</script></body></html>'
+
+    def careerly(self, b: Board, page: int, posts: bool) -> dict:
+        results = []
+        for item_id in b.ids(page - 1):
+            rnd = random.Random(item_id)
+            item = {
+                "id": item_id,
+                "title": words(rnd, 6),
+                "like_count": rnd.randint(0, 99),
+                "view_count": rnd.randint(1, 9999),
+                "createdat": b.when(item_id).isoformat() + "+09:00",
+            }
+            if posts:
+                item.update({
+                    "description": "",
+                    "descriptionhtml": body_html(item_id),
+                    "author": {"name": f"user{item_id % 997}", "headline": words(rnd, 2)},
+                    "comment_count": rnd.randint(0, 30),
+                    "save_count": rnd.randint(0, 30),
+                })
+            else:
+                item.update({
+                    "description": words(rnd, rnd.randint(20, 80)),
+                    "author_name": f"user{item_id % 997}",
+                    "author_headline": words(rnd, 2),
+                    "answer_count": rnd.randint(0, 9),
+                })
+            results.append(item)
+        return {"count": b.total, "results": results}
+
+    def itunion_list(self, base: str, page: int) -> str:
+        b = self.itunion
+        rows = []
+        for srl in b.ids(page - 1):
+            rnd = random.Random(srl)
+            rows.append(
+                f'<tr><td class="no">{srl}</td><td class="cate"><span>질문</span></td>'
+                f'<td class="title"><a href="{base}?mid=JOBQNA01&amp;page={page}&amp;document_srl={srl}" class="hx">{words(rnd, 6)}</a>'
+                f'<a href="#" class="replyNum">{rnd.randint(1, 20)}</a></td>'
+                f'<td class="author"><span>user{srl % 997}</span></td>'
+                f'<td class="time" title="{b.when(srl):%H:%M}">{b.when(srl):%Y.%m.%d}</td>'
+                f'<td class="m_no">{rnd.randint(10, 5000):,}</td></tr>'
+            )
+        links = "".join(f'<a href="{base}?mid=JOBQNA01&amp;page={p}">{p}</a>' for p in range(1, b.pages + 1))
+        return (
+            '<html><head><title>IT노조</title></head><body><table class="bd_lst"><tbody>'
+            + "".join(rows)
+            + f'</tbody></table><form class="bd_pg">{links}</form></body></html>'
+        )
+
+    def itunion_detail(self, srl: int) -> str:
+        rnd = random.Random(srl)
+        when = self.itunion.when(srl)
+        return (
+            '<html><body><div class="rd"><strong class="cate fl">질문</strong>'
+            f'<span class="date m_no">{when:%Y.%m.%d %H:%M}</span>'
+            '<div class="btm_area"><div class="side fr">'
+            f'<span>조회 수 <b>{rnd.randint(10, 9999)}</b></span><span>추천 수 <b>{rnd.randint(0, 30)}</b></span>'
+            f'<span>비추천 수 <b>{rnd.randint(0, 5)}</b></span><span>댓글 <b>{rnd.randint(0, 20)}</b></span></div></div>'
+            f'<div class="xe_content">{body_html(srl)}</div>'
+            f'<div class="tag_list"><a href="#">#{words(rnd, 1)}</a><a href="#">#{words(rnd, 1)}</a></div>'
+            '</div></body></html>'
+        )
+
+    def route(self, path: str, qs: dict):
+        page = int((qs.get("page") or ["1"])[0])
+        if path.startswith("/okky"):
+            rest = path[len("/okky"):] or "/"
+            if rest == "/":
+                return "text/html", f'<html><script>{{"buildId":"{BUILD_ID}"}}</script></html>'
+            if rest == "/api/okky-web/articles":
+                return "application/json", self.okky_list(qs["categoryCode"][0], page)
+            if rest.startswith(f"/_next/data/{BUILD_ID}/articles/"):
+                return "application/json", self.okky_detail(int(rest.rsplit("/", 1)[1].split(".")[0]))
+            if rest.startswith("/articles/"):
+                return "text/html", self.okky_page(int(rest.rsplit("/", 1)[1]))
+        elif path.startswith("/careerly/api/v1/questions"):
+            return "application/json", self.careerly(self.questions, page, posts=False)
+        elif path.startswith("/careerly/api/v1/posts"):
+            return "application/json", self.careerly(self.posts, page, posts=True)
+        elif path.startswith("/itunion/xe/index.php"):
+            if "document_srl" in qs:
+                return "text/html", self.itunion_detail(int(qs["document_srl"][0]))
+            return "text/html", self.itunion_list(path, page)
+        return None
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sites: Sites = None
+    lock = threading.Lock()
+    counts = {}
+
+    def log_message(self, *a):
+        pass
+
+    def encode(self, body: bytes) -> tuple:
+        if not self.sites.cfg["compress"] or len(body) < 256:
+            return body, None
+        accept = {e.split(";")[0].strip() for e in (self.headers.get("Accept-Encoding") or "").split(",")}
+        if "br" in accept and brotli is not None:
+            return brotli.compress(body, quality=5), "br"
+        if "gzip" in accept:
+            return gzip.compress(body, compresslevel=6), "gzip"
+        return body, None
+
+    def reply(self, status: int, ctype: str, body: bytes, headers: dict = None):
+        body, enc = self.encode(body)
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        if enc:
+            self.send_header("Content-Encoding", enc)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def do_GET(self):
+        cfg = self.sites.cfg
+        time.sleep(max(0.0, cfg["latency"] + random.uniform(-cfg["jitter"], cfg["jitter"])))
+        u = urlsplit(self.path)
+
+        if u.path == "/_stats":
+            with self.lock:
+                return self.reply(200, "application/json", json.dumps(self.counts).encode())
+
+        roll = random.random()
+        if roll < cfg["p429"]:
+            self.count(429)
+            return self.reply(429, "text/plain", b"slow down", {"Retry-After": str(cfg["retry_after"])})
+        if roll < cfg["p429"] + cfg["p5xx"]:
+            self.count(503)
+            return self.reply(503, "text/plain", b"unavailable")
+
+        fixture = cfg["fixtures"] and Path(cfg["fixtures"]) / (u.path.strip("/") + ("?" + u.query if u.query else ""))
+        if fixture and fixture.is_file():
+            self.count(200)
+            ctype = "application/json" if fixture.suffix == ".json" else "text/html"
+            return self.reply(200, f"{ctype}; charset=utf-8", fixture.read_bytes())
+
+        got = self.sites.route(u.path, parse_qs(u.query))
+        if got is None:
+            self.count(404)
+            return self.reply(404, "text/plain", b"not found")
+        ctype, body = got
+        if not isinstance(body, str):
+            body = json.dumps(body, ensure_ascii=False)
+        self.count(200)
+        self.reply(200, f"{ctype}; charset=utf-8", body.encode("utf-8"))
+
+def make_server(cfg: dict, port: int = 0) -> ThreadingHTTPServer:
+    Handler.sites = Sites({**DEFAULTS, **cfg})
+    srv = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    srv.daemon_threads = True
+    return srv
+
+def serve(cfg: dict, port: int = 0, ready=None):
+    srv = make_server(cfg, port)
+    if ready is not None:
+        ready.put(srv.server_address[1])
+    srv.serve_forever()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8800)
+    for k, v in DEFAULTS.items():
+        ap.add_argument(f"--{k.replace('_', '-')}", type=type(v) if v is not None else str, default=v)
+    args = vars(ap.parse_args())
+    port = args.pop("port")
+    print(f"stand-in 서버: http://127.0.0.1:{port} ({args})")
+    serve(args, port)
+
+if __name__ == "__main__":
+    main()
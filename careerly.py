@@ -1,34 +1,55 @@
 import os
 import re
 import json
-import time
 import math
-import random
-import threading
-import requests
-import pandas as pd
+import time
+import sys
+import asyncio
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
+from crawlcore.engine import Engine, AuthError
+from crawlcore.metrics import Metrics
+from crawlcore.watermark import Watermarks
+from crawlcore.pagelocate import PageLocator
+from crawlcore.paginate import paginate
+from crawlcore.sink import RecordSink
+from crawlcore.dataset import ParquetSink
+from crawlcore.journal import Journal, window_key
+from crawlcore.store import StoreSink
+from crawlcore import htmlparse as hp
+from crawlcore.htmlparse import html_text
+from crawlcore import neardup
+from crawlcore import trace
+from crawlcore import parsepool
+from crawlcore.parsepool import ParsePool
+
 KAKAO_EMAIL = os.environ.get("CAREERLY_EMAIL", "")
 KAKAO_PASSWORD = os.environ.get("CAREERLY_PASS", "")
 
 ZERO_STREAK_STOP = 5
+INCREMENTAL = False
+NEAR_DUP = False
+NEAR_DUP_SKIP = False
 WORKERS = 8
+PAGE_WINDOW = 4
+PARSE_PROCS = 0
 MAX_QPS = 6.0
 RETRIES = 4
 TIMEOUT = 20
+ADAPTIVE = False
+SHARED_RATE = True
 
 OUTPUT_DIR = Path(".")
+OUTPUT_FORMAT = "csv"
 CHECKPOINT_DIR = Path("./.crawl_checkpoint")
+COOKIE_FILE = Path("./.crawl_state/careerly_cookies.json")
 TODAY = datetime.now().strftime("%Y%m%d_%H%M")
-CHECKPOINT_DIR.mkdir(exist_ok=True)
 
-API_BASE = "https://v2.careerly.co.kr/api/v1"
+API_HOST = "v2.careerly.co.kr"
+API_BASE = f"https://{API_HOST}/api/v1"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0",
@@ -37,58 +58,133 @@ HEADERS = {
     "Referer": "https://www.careerly.co.kr/",
 }
 
-_qps_lock = threading.Lock()
-_tokens = MAX_QPS
-_last_ref = time.monotonic()
-
-def _acquire():
-    global _tokens, _last_ref
-    while True:
-        with _qps_lock:
-            now = time.monotonic()
-            _tokens = min(MAX_QPS, _tokens + (now - _last_ref) * MAX_QPS)
-            _last_ref = now
-            if _tokens >= 1.0:
-                _tokens -= 1.0
-                return
-        time.sleep(0.01)
-
-_sess: Optional[requests.Session] = None
-
-def get_sess():
-    assert _sess is not None
-    return _sess
-
-def api_get(url: str) -> dict:
-    backoff = 0.5
-    last_err = None
-    for _ in range(RETRIES):
+QNA_COLS = [
+    "id", "title", "description", "author", "author_headline",
+    "answer_count", "like_count", "view_count", "created_at",
+]
+
+POST_COLS = [
+    "id", "title", "description", "author", "author_headline",
+    "comment_count", "like_count", "view_count", "save_count", "created_at",
+]
+
+PARQUET_TYPES = {
+    "id": "int", "author": "category",
+    "answer_count": "int", "comment_count": "int", "like_count": "int",
+    "view_count": "int", "save_count": "int", "created_at": "datetime",
+}
+
+_marks = Watermarks("careerly", enabled=INCREMENTAL)
+_journal: Optional[Journal] = None
+_near: Optional[neardup.NearDupIndex] = None
+_engine: Optional[Engine] = None
+_pool = ParsePool(0)
+_auth_gen = 0
+_auth_failed: Optional[str] = None
+_auth_ready: Optional[asyncio.Event] = None
+_auth_lock: Optional[asyncio.Lock] = None
+
+def get_engine() -> Engine:
+    assert _engine is not None
+    return _engine
+
+def set_cookies(cookies: list):
+    jar = get_engine().hosts[API_HOST].client.cookies
+    jar.clear()
+    for c in cookies:
+        jar.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+def dump_cookies() -> list:
+    return [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path, "expires": c.expires or -1}
+        for c in get_engine().hosts[API_HOST].client.cookies.jar
+    ]
+
+def load_cookies() -> list:
+    try:
+        cookies = json.loads(COOKIE_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return []
+    now = time.time()
+    return [c for c in cookies if not c.get("expires") or c["expires"] < 0 or c["expires"] > now]
+
+def save_cookies(cookies: list):
+    if not cookies:
+        return
+    COOKIE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = COOKIE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cookies, ensure_ascii=False), encoding="utf-8")
+    os.chmod(tmp, 0o600)
+    os.replace(tmp, COOKIE_FILE)
+
+def make_engine(cookies: list) -> Engine:
+    global _engine, _auth_gen, _auth_failed, _auth_ready, _auth_lock, _pool
+    _pool = ParsePool(parsepool.procs(PARSE_PROCS), parsepool.settings(__name__, hp.__name__))
+    eng = Engine(HEADERS, retries=RETRIES, timeout=TIMEOUT, metrics=Metrics("careerly"), adaptive=ADAPTIVE,
+                 shared_rate=SHARED_RATE, pool=_pool)
+    eng.host(API_HOST, qps=MAX_QPS, concurrency=WORKERS)
+    _engine = eng
+    set_cookies(cookies)
+    _auth_gen, _auth_failed = 0, None
+    _auth_ready, _auth_lock = asyncio.Event(), asyncio.Lock()
+    _auth_ready.set()
+    return eng
+
+@trace.traced("login")
+def login_with_prompt() -> list:
+    email = KAKAO_EMAIL or input("카카오 이메일: ").strip()
+    password = KAKAO_PASSWORD or input("카카오 비밀번호: ").strip()
+    return login(email, password)
+
+async def session_ok() -> bool:
+    try:
+        await get_engine().get(f"{API_BASE}/questions/?page=1")
+        return True
+    except AuthError:
+        return False
+
+@trace.traced("login")
+async def ensure_session():
+    if dump_cookies() and await session_ok():
+        print("[auth] 저장된 세션 사용")
+        return
+    cookies = await asyncio.to_thread(login_with_prompt)
+    set_cookies(cookies)
+    save_cookies(cookies)
+
+@trace.traced("login")
+async def relogin(gen: int):
+    global _auth_gen, _auth_failed
+    async with _auth_lock:
+        if _auth_gen != gen or _auth_failed:
+            return
+        _auth_ready.clear()
+        print("[auth] 세션 만료 - 재로그인 중 (요청 일시 정지)")
         try:
-            _acquire()
-            r = get_sess().get(url, timeout=TIMEOUT)
-            if r.status_code == 401:
-                raise RuntimeError("인증 만료")
-            if r.status_code == 429:
-                wait = float(r.headers.get("Retry-After", backoff * 2)) + random.random()
-                time.sleep(wait)
-                backoff = min(backoff * 2, 30)
-                continue
-            if 500 <= r.status_code < 600:
-                time.sleep(backoff)
-                backoff = min(backoff * 2, 20)
-                continue
-            r.raise_for_status()
-            return r.json()
-        except RuntimeError:
-            raise
+            cookies = await asyncio.to_thread(login_with_prompt)
+            set_cookies(cookies)
+            save_cookies(cookies)
+            _auth_gen += 1
+            print("[auth] 재로그인 완료 - 재개")
         except Exception as e:
-            last_err = e
-            time.sleep(backoff)
-            backoff = min(backoff * 2, 15)
-    raise last_err
+            _auth_failed = repr(e)
+        finally:
+            _auth_ready.set()
+
+async def api_get(url: str) -> dict:
+    for attempt in range(2):
+        await _auth_ready.wait()
+        if _auth_failed:
+            raise AuthError(f"재로그인 실패: {_auth_failed}")
+        gen = _auth_gen
+        try:
+            return await get_engine().get(url)
+        except AuthError:
+            if attempt:
+                raise
+            await relogin(gen)
 
-def login(email: str = "", password: str = "") -> requests.Session:
-    global _sess
+def login(email: str = "", password: str = "") -> list:
     from playwright.sync_api import sync_playwright
 
     with sync_playwright() as pw:
@@ -130,12 +226,7 @@ def login(email: str = "", password: str = "") -> requests.Session:
         cookies = ctx.cookies()
         browser.close()
 
-    sess = requests.Session()
-    sess.headers.update(HEADERS)
-    for c in cookies:
-        sess.cookies.set(c["name"], c["value"], domain=c.get("domain", ""))
-    _sess = sess
-    return sess
+    return cookies
 
 def to_str(v):
     if v is None:
@@ -191,131 +282,210 @@ def author_info(a):
         return safe(a.get("name")), safe(a.get("headline"))
     return "", ""
 
-def crawl_questions(date_start: Optional[datetime], date_end: Optional[datetime]) -> list:
-    first = api_get(f"{API_BASE}/questions/?page=1")
+def item_dates(data: dict) -> list:
+    out = []
+    for item in data.get("results") or []:
+        dt = parse_dt(item.get("createdat") or "")
+        out.append(dt.date() if dt else None)
+    return out
+
+async def locate(url: str, first: dict, total_pages: int,
+                 date_start: Optional[datetime], date_end: Optional[datetime]) -> tuple[PageLocator, int, int]:
+    loc = PageLocator(lambda p: api_get(f"{url}page={p}"), item_dates)
+    loc.seed(1, first)
+    lo, hi = await loc.locate(
+        total_pages,
+        date_start.date() if date_start else None,
+        date_end.date() if date_end else None,
+    )
+    print(f"페이지 범위: {lo}~{hi} / {total_pages} (탐색 {loc.probes}회)")
+    return loc, lo, hi
+
+@trace.traced("parse")
+def parse_questions(data: dict, date_start: Optional[datetime], date_end: Optional[datetime]) -> tuple[list, bool]:
+    raw = data.get("results") or []
+    out = []
+    reached = False
+    for item in raw:
+        if not _marks.is_new("questions", item.get("id")):
+            reached = True
+            continue
+        dt = parse_dt(item.get("createdat") or "")
+        if not in_range(dt, date_start, date_end):
+            continue
+
+        out.append({
+            "id": to_str(item.get("id")),
+            "title": (item.get("title") or "").strip(),
+            "description": (item.get("description") or "").strip(),
+            "author": (item.get("author_name") or "").strip(),
+            "author_headline": (item.get("author_headline") or "").strip(),
+            "answer_count": to_str(item.get("answer_count")),
+            "like_count": to_str(item.get("like_count")),
+            "view_count": to_str(item.get("view_count")),
+            "created_at": (item.get("createdat") or "").strip(),
+        })
+
+    return out, reached
+
+@trace.traced("parse")
+def parse_posts(data: dict, date_start: Optional[datetime], date_end: Optional[datetime]) -> tuple[list, bool]:
+    raw = data.get("results") or []
+    out = []
+    reached = False
+    for item in raw:
+        if not _marks.is_new("posts", item.get("id")):
+            reached = True
+            continue
+        dt = parse_dt(item.get("createdat") or "")
+        if not in_range(dt, date_start, date_end):
+            continue
+
+        name, headline = author_info(item.get("author"))
+        rec = {
+            "id": to_str(item.get("id")),
+            "title": (item.get("title") or "").strip(),
+            "description": (item.get("description") or "").strip(),
+            "author": name,
+            "author_headline": headline,
+            "comment_count": to_str(item.get("comment_count")),
+            "like_count": to_str(item.get("like_count")),
+            "view_count": to_str(item.get("view_count")),
+            "save_count": to_str(item.get("save_count")),
+            "created_at": (item.get("createdat") or "").strip(),
+        }
+        if not rec["description"] and item.get("descriptionhtml"):
+            rec["_html"] = item["descriptionhtml"]
+        out.append(rec)
+
+    return out, reached
+
+async def fill_html_text(out: list):
+    todo = [(r, r.pop("_html")) for r in out if "_html" in r]
+    if not todo:
+        return
+    texts = await _pool.map(html_text, [html for _, html in todo])
+    for (r, _), text in zip(todo, texts):
+        r["description"] = text
+
+@trace.traced("list")
+async def crawl_board(key: str, url: str, parse, date_start: Optional[datetime], date_end: Optional[datetime],
+                      sink, desc: str) -> int:
+    first = await api_get(f"{url}page=1")
     total_count = first.get("count", 0)
     page_size = len(first.get("results") or [1])
     total_pages = math.ceil(total_count / max(page_size, 1))
+    loc, lo, hi = await locate(url, first, total_pages, date_start, date_end)
 
-    def fetch_page(p: int) -> tuple[list, int]:
-        data = api_get(f"{API_BASE}/questions/?page={p}")
-        raw = data.get("results") or []
-        out = []
-        hits = 0
-
-        for item in raw:
-            dt = parse_dt(item.get("createdat") or "")
-            if not in_range(dt, date_start, date_end):
-                continue
-
-            out.append({
-                "id": to_str(item.get("id")),
-                "title": (item.get("title") or "").strip(),
-                "description": (item.get("description") or "").strip(),
-                "author": (item.get("author_name") or "").strip(),
-                "author_headline": (item.get("author_headline") or "").strip(),
-                "answer_count": to_str(item.get("answer_count")),
-                "like_count": to_str(item.get("like_count")),
-                "view_count": to_str(item.get("view_count")),
-                "created_at": (item.get("createdat") or "").strip(),
-            })
-            hits += 1
-
-        return out, hits
-
-    records = []
-    zero_streak = 0
-
-    with tqdm(total=total_pages, desc="QnA", unit="p") as pbar:
-        with ThreadPoolExecutor(max_workers=WORKERS) as ex:
-            futs = {ex.submit(fetch_page, p): p for p in range(1, total_pages + 1)}
-            for fut in as_completed(futs):
-                p = futs[fut]
-                try:
-                    out, hits = fut.result()
-                    records.extend(out)
-                    zero_streak = 0 if hits else zero_streak + 1
-                    if zero_streak >= ZERO_STREAK_STOP:
-                        for f in futs:
-                            try:
-                                f.cancel()
-                            except:
-                                pass
-                        break
-                except:
-                    pass
-                pbar.update(1)
-
-    return records
-
-def crawl_posts(date_start: Optional[datetime], date_end: Optional[datetime]) -> list:
-    first = api_get(f"{API_BASE}/posts/?exclude_following=true&page=1")
-    total_count = first.get("count", 0)
-    page_size = len(first.get("results") or [1])
-    total_pages = math.ceil(total_count / max(page_size, 1))
+    async def fetch(p: int):
+        got = _journal.page(key, p)
+        if got is not None:
+            return got["out"], got["reached"]
+        try:
+            data = loc.take(p) or await api_get(f"{url}page={p}")
+        except AuthError:
+            raise
+        except Exception as e:
+            print(f"[{desc}] 페이지 오류 p={p}: {e}")
+            _marks.hold(key)
+            return None
+        out, reached = parse(data, date_start, date_end)
+        await fill_html_text(out)
+        _journal.page_done(key, p, out=out, reached=reached)
+        return out, reached
 
-    records = []
     zero_streak = 0
 
-    for p in tqdm(range(1, total_pages + 1), desc="Posts", unit="p"):
-        data = api_get(f"{API_BASE}/posts/?exclude_following=true&page={p}")
-        raw = data.get("results") or []
-
-        hits = 0
-        for item in raw:
-            dt = parse_dt(item.get("createdat") or "")
-            if not in_range(dt, date_start, date_end):
-                continue
-
-            name, headline = author_info(item.get("author"))
-            desc = (item.get("description") or "").strip()
-            if not desc:
-                html = item.get("descriptionhtml") or ""
-                if html:
-                    desc = BeautifulSoup(html, "lxml").get_text("\n", strip=True)
-
-            records.append({
-                "id": to_str(item.get("id")),
-                "title": (item.get("title") or "").strip(),
-                "description": desc,
-                "author": name,
-                "author_headline": headline,
-                "comment_count": to_str(item.get("comment_count")),
-                "like_count": to_str(item.get("like_count")),
-                "view_count": to_str(item.get("view_count")),
-                "save_count": to_str(item.get("save_count")),
-                "created_at": (item.get("createdat") or "").strip(),
-            })
-            hits += 1
-
-        zero_streak = 0 if hits else zero_streak + 1
-        if zero_streak >= ZERO_STREAK_STOP:
-            break
-
-    return records
-
-def save_csv(name: str, rows: list):
-    df = pd.DataFrame(rows).drop_duplicates("id").reset_index(drop=True)
-    out = OUTPUT_DIR / f"{name}_{TODAY}.csv"
-    df.to_csv(out, index=False, encoding="utf-8-sig")
-    print(f"{name}: {len(df)}건 -> {out}")
+    with tqdm(total=max(hi - lo + 1, 0), desc=desc, unit="p") as pbar:
+        def consume(p: int, got) -> bool:
+            nonlocal zero_streak
+            pbar.update(1)
+            if got is None:
+                return False
+            out, reached = got
+            if _near is not None:
+                for r in out:
+                    _near.tag(r, f"careerly_{key}:{r['id']}", "description", skip=NEAR_DUP_SKIP)
+            sink.write_many(out)
+            _marks.advance(key, out, "id", "created_at")
+            zero_streak = 0 if out else zero_streak + 1
+            return zero_streak >= ZERO_STREAK_STOP or reached
+
+        await paginate(range(lo, hi + 1), fetch, consume, window=PAGE_WINDOW)
+
+    return sink.count
+
+async def crawl_questions(date_start: Optional[datetime], date_end: Optional[datetime], sink) -> int:
+    return await crawl_board("questions", f"{API_BASE}/questions/?", parse_questions, date_start, date_end, sink, "QnA")
+
+async def crawl_posts(date_start: Optional[datetime], date_end: Optional[datetime], sink) -> int:
+    return await crawl_board("posts", f"{API_BASE}/posts/?exclude_following=true&", parse_posts,
+                             date_start, date_end, sink, "Posts")
+
+def open_sink(name: str, cols: list):
+    if NEAR_DUP:
+        cols = cols + ["cluster_id"]
+    if OUTPUT_FORMAT == "parquet":
+        return ParquetSink(name, cols, PARQUET_TYPES, key="id", date_field="created_at")
+    if OUTPUT_FORMAT == "sqlite":
+        return StoreSink(name, cols, key="id", title="title", body="description", date_field="created_at", author="author")
+    return RecordSink(OUTPUT_DIR / f"{name}_{TODAY}.{OUTPUT_FORMAT}", cols, key="id")
+
+def report(name: str, sink):
+    if not sink.count:
+        print(f"{name}: 0건")
+        return
+    print(f"{name}: {sink.count}건 -> {sink.path}")
+
+@trace.traced("window")
+async def crawl_window(date_start: Optional[datetime], date_end: Optional[datetime]) -> int:
+    global _journal, _near
+    _marks.begin(INCREMENTAL)
+    failed0 = _engine.metrics.failures()
+    _journal = Journal("careerly", {"start": date_start, "end": date_end}, root=CHECKPOINT_DIR,
+                       window=window_key(date_start, date_end))
+    _near = neardup.shared() if NEAR_DUP else None
+
+    with open_sink("careerly_qna", QNA_COLS) as qna:
+        await crawl_questions(date_start, date_end, qna)
+    with open_sink("careerly_posts", POST_COLS) as posts:
+        await crawl_posts(date_start, date_end, posts)
+
+    report("careerly_qna", qna)
+    report("careerly_posts", posts)
+    if _near is not None:
+        _near.save()
+        print(_near.report())
+    _journal.finish(_engine.metrics.failures() - failed0)
+    return qna.count + posts.count
+
+async def run(cookies: list, date_start: Optional[datetime], date_end: Optional[datetime]):
+    if INCREMENTAL:
+        print("증분 수집:", _marks.describe("questions"), "/", _marks.describe("posts"))
+
+    async with make_engine(cookies) as eng:
+        await ensure_session()
+        try:
+            await crawl_window(date_start, date_end)
+        finally:
+            save_cookies(dump_cookies())
+        print(eng.rate_report())
 
-def main():
-    email = KAKAO_EMAIL or input("카카오 이메일: ").strip()
-    password = KAKAO_PASSWORD or input("카카오 비밀번호: ").strip()
-    login(email, password)
+    _marks.save()
 
+def main():
     print("기간 필터를 입력하세요. (엔터=제한없음)")
     s = input("시작일 (YYYY-MM-DD 또는 YYYYMMDD): ").strip()
     e = input("종료일 (YYYY-MM-DD 또는 YYYYMMDD): ").strip()
     date_start = parse_input_date(s) if s else None
     date_end = parse_input_date(e) if e else None
 
-    qna = crawl_questions(date_start, date_end)
-    posts = crawl_posts(date_start, date_end)
-
-    save_csv("careerly_qna", qna)
-    save_csv("careerly_posts", posts)
+    if "--profile" in sys.argv:
+        trace.start("careerly")
+    try:
+        asyncio.run(run(load_cookies(), date_start, date_end))
+    finally:
+        trace.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
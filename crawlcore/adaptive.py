@@ -0,0 +1,167 @@
+import time
+import asyncio
+from collections import deque
+from typing import Optional
+
+EVAL_SEC = 5.0
+MIN_SAMPLES = 10
+ERROR_RATE = 0.05
+LATENCY_RISE = 1.5
+DECREASE = 0.5
+LATENCY_DECREASE = 0.8
+QPS_STEP = 0.1
+MIN_QPS = 0.5
+BREAKER_FAILS = 8
+BREAKER_SEC = 30.0
+BREAKER_MAX_SEC = 600.0
+
+class Gate:
+    def __init__(self, limit: int):
+        self.limit = max(1, int(limit))
+        self.active = 0
+        self.waiters = deque()
+        self.queued = 0
+
+    def _wake(self):
+        while self.waiters and self.active < self.limit:
+            f = self.waiters.popleft()
+            if not f.done():
+                self.active += 1
+                f.set_result(None)
+
+    async def acquire(self):
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return
+        f = asyncio.get_running_loop().create_future()
+        self.waiters.append(f)
+        self.queued += 1
+        try:
+            await f
+        except asyncio.CancelledError:
+            if f.done() and not f.cancelled():
+                self.release()
+            else:
+                try:
+                    self.waiters.remove(f)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def resize(self, limit: int):
+        self.limit = max(1, int(limit))
+        self._wake()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *a):
+        self.release()
+
+def _p95(xs: list) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(0.95 * len(xs)))]
+
+class Controller:
+    def __init__(self, name: str, gate: Gate, limiter, metrics=None):
+        self.name = name
+        self.gate = gate
+        self.limiter = limiter
+        self.metrics = metrics
+        self.min_conc, self.max_conc = 1, gate.limit
+        self.min_qps, self.max_qps = min(MIN_QPS, limiter.qps), limiter.qps
+        self.qps_step = max(limiter.qps * QPS_STEP, 0.1)
+        self.reset()
+        self.base_p95: Optional[float] = None
+        self.fails = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.saved = (gate.limit, limiter.qps)
+        self.decisions = []
+
+    def reset(self):
+        self.t0 = time.monotonic()
+        self.n = 0
+        self.throttled = 0
+        self.errors = 0
+        self.lat = []
+        self.queued0 = self.gate.queued
+
+    def log(self, action: str, why: str, **extra):
+        d = {
+            "ts": round(time.time(), 3), "host": self.name, "action": action, "why": why,
+            "concurrency": self.gate.limit, "qps": round(self.limiter.qps, 2), **extra,
+        }
+        self.decisions.append(d)
+        if self.metrics is not None:
+            self.metrics.decision(d)
+        print(f"[adapt] {self.name} {action}: conc={self.gate.limit} qps={self.limiter.qps:.1f} ({why})")
+
+    def set(self, conc: int, qps: float):
+        self.gate.resize(min(self.max_conc, max(self.min_conc, conc)))
+        self.limiter.qps = min(self.max_qps, max(self.min_qps, qps))
+
+    def observe(self, status: int, seconds: float):
+        now = time.monotonic()
+        ok = 0 < status < 500 and status != 429
+        self.n += 1
+        if status == 429:
+            self.throttled += 1
+        elif not ok:
+            self.errors += 1
+        else:
+            self.lat.append(seconds)
+
+        self.fails = 0 if ok or status == 429 else self.fails + 1
+        if self.fails >= BREAKER_FAILS and now >= self.open_until:
+            self.trip(now)
+            return
+        if ok and self.trips and now >= self.open_until:
+            self.trips = 0
+            conc, qps = self.saved
+            self.set(int(conc * DECREASE), qps * DECREASE)
+            self.log("close", "응답 정상화")
+
+        if now - self.t0 >= EVAL_SEC and self.n >= MIN_SAMPLES:
+            self.evaluate()
+
+    def trip(self, now: float):
+        self.trips += 1
+        sec = min(BREAKER_SEC * 2 ** (self.trips - 1), BREAKER_MAX_SEC)
+        self.open_until = now + sec
+        self.fails = 0
+        if self.trips == 1:
+            self.saved = (self.gate.limit, self.limiter.qps)
+        self.limiter.pause(sec)
+        self.set(1, self.min_qps)
+        self.log("open", f"연속 실패 {BREAKER_FAILS}회, {sec:.0f}s 차단", pause_sec=sec)
+        self.reset()
+
+    def evaluate(self):
+        n, bad = self.n, self.throttled + self.errors
+        p95 = _p95(self.lat)
+        busy = self.gate.queued > self.queued0
+        conc, qps = self.gate.limit, self.limiter.qps
+        stats = {"n": n, "throttled": self.throttled, "errors": self.errors, "p95_ms": round(p95 * 1000, 1)}
+
+        if self.throttled or bad / n > ERROR_RATE:
+            self.set(int(conc * DECREASE), qps * DECREASE)
+            self.log("decrease", f"429={self.throttled} 오류={self.errors} / {n}", **stats)
+        elif self.base_p95 and p95 > self.base_p95 * LATENCY_RISE:
+            self.set(int(conc * LATENCY_DECREASE), qps * LATENCY_DECREASE)
+            self.log("decrease", f"p95 {p95 * 1000:.0f}ms > 기준 {self.base_p95 * 1000:.0f}ms x{LATENCY_RISE}", **stats)
+        elif busy and (conc < self.max_conc or qps < self.max_qps):
+            self.set(conc + 1, qps + self.qps_step)
+            if (self.gate.limit, self.limiter.qps) != (conc, qps):
+                self.log("increase", f"동시성 대기 발생, 오류 없음, p95 {p95 * 1000:.0f}ms", **stats)
+
+        if p95 and not self.throttled and not self.errors:
+            self.base_p95 = p95 if self.base_p95 is None else min(p95, self.base_p95 * 1.05)
+        self.reset()
@@ -0,0 +1,148 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from crawlcore.sink import SeenSet
+from crawlcore import trace
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DATASET_DIR = Path("./dataset")
+FLUSH_ROWS = 5000
+FLUSH_BYTES = 32 * 1024 ** 2
+COMPACT_MIN_FILES = 8
+COMPRESSION = "zstd"
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet 저장에는 pyarrow 가 필요합니다: pip install pyarrow")
+
+def arrow_type(kind: str):
+    return {
+        "int": pa.int64(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+    }.get(kind, pa.string())
+
+def build_schema(columns: list, types: dict):
+    return pa.schema([(c, arrow_type(types.get(c, "str"))) for c in columns])
+
+class ParquetSink:
+    def __init__(self, source: str, columns: list, types: dict, key: str, date_field: str,
+                 root: Path = DATASET_DIR):
+        require_pyarrow()
+        self.source = source
+        self.columns = list(columns)
+        if key not in self.columns:
+            self.columns.append(key)
+        self.types = types
+        self.key = key
+        self.date_field = date_field
+        self.schema = build_schema(self.columns, types)
+        self.path = Path(root) / f"source={source}"
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self.buf = []
+        self.buf_bytes = 0
+        self.seen = SeenSet()
+        self.touched = set()
+        self.count = 0
+        self.files = 0
+
+    def write(self, rec: dict) -> bool:
+        k = rec.get(self.key)
+        if k and not self.seen.add(k):
+            return False
+        self.buf.append(rec)
+        self.buf_bytes += sum(len(v) for v in rec.values() if isinstance(v, str))
+        self.count += 1
+        if len(self.buf) >= FLUSH_ROWS or self.buf_bytes >= FLUSH_BYTES:
+            self.flush()
+        return True
+
+    def write_many(self, recs) -> int:
+        return sum(1 for r in recs if self.write(r))
+
+    @trace.traced("save")
+    def flush(self):
+        if not self.buf:
+            return
+        from crawlcore.normalize import TZ, frame, to_datetimes
+
+        df = frame(self.buf, self.columns, self.types)
+        when = df[self.date_field] if self.types.get(self.date_field) == "datetime" else to_datetimes(df[self.date_field])
+        days = when.dt.tz_convert(TZ).dt.strftime("%Y-%m-%d").fillna("unknown")
+        for day, rows in df.groupby(days, sort=False):
+            d = self.path / f"created_date={day}"
+            d.mkdir(parents=True, exist_ok=True)
+            out = d / f"part-{self.run_id}-{self.files:05d}.parquet"
+            tmp = out.with_suffix(".tmp")
+            pq.write_table(pa.Table.from_pandas(rows, schema=self.schema, preserve_index=False), tmp,
+                           compression=COMPRESSION)
+            os.replace(tmp, out)
+            self.files += 1
+            self.touched.add(d)
+        self.buf = []
+        self.buf_bytes = 0
+
+    def finalize(self) -> Optional[Path]:
+        self.flush()
+        for d in sorted(self.touched):
+            if len(list(d.glob("part-*.parquet"))) >= COMPACT_MIN_FILES:
+                compact_partition(d, self.key)
+        return self.path if self.count else None
+
+    def abort(self):
+        self.flush()
+        print(f"중단: {self.path} 에 {self.count}건까지 기록")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *a):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
+
+def compact_partition(d: Path, key: str, order: str = "crawled_at") -> int:
+    require_pyarrow()
+    files = sorted(d.glob("part-*.parquet"))
+    if len(files) < 2:
+        return len(files)
+    table = pa.concat_tables([pq.read_table(f) for f in files], promote_options="permissive")
+    df = table.to_pandas()
+    if order in df.columns:
+        df = df.sort_values(order, kind="stable")
+    df = df.drop_duplicates(key, keep="last")
+    out = d / f"part-compact-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.parquet"
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(df, schema=table.schema, preserve_index=False), tmp, compression=COMPRESSION)
+    os.replace(tmp, out)
+    for f in files:
+        f.unlink()
+    return len(df)
+
+def compact(source: str, key: str, root: Path = DATASET_DIR):
+    for d in sorted((Path(root) / f"source={source}").glob("created_date=*")):
+        n = compact_partition(d, key)
+        print(f"[compact] {d} -> {n}건")
+
+def read(source: str, start=None, end=None, columns: Optional[list] = None, root: Path = DATASET_DIR):
+    require_pyarrow()
+    import pyarrow.dataset as ds
+
+    part = ds.partitioning(pa.schema([("created_date", pa.string())]), flavor="hive")
+    dset = ds.dataset(Path(root) / f"source={source}", format="parquet", partitioning=part)
+    flt = None
+    if start is not None:
+        flt = ds.field("created_date") >= str(start)
+    if end is not None:
+        e = ds.field("created_date") <= str(end)
+        flt = e if flt is None else flt & e
+    return dset.to_table(columns=columns, filter=flt).to_pandas()
@@ -0,0 +1,242 @@
+import time
+import json
+import asyncio
+from typing import Optional
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+try:
+    import brotlicffi as _brotli
+except ImportError:
+    try:
+        import brotli as _brotli
+    except ImportError:
+        _brotli = None
+
+from crawlcore.ratelimit import RateLimiter, SharedRateLimiter, SHARED_OK
+from crawlcore.httpcache import HttpCache
+from crawlcore.parsepool import ParsePool
+from crawlcore.metrics import Metrics
+from crawlcore.adaptive import Gate, Controller
+from crawlcore import trace
+
+RETRIES = 4
+TIMEOUT = 20
+DEFAULT_QPS = 5.0
+DEFAULT_CONCURRENCY = 8
+ACCEPT_ENCODING = "br, gzip, deflate" if _brotli is not None else "gzip, deflate"
+
+class FetchError(Exception):
+    pass
+
+class AuthError(FetchError):
+    pass
+
+class Host:
+    def __init__(self, name: str, qps: float, concurrency: int, headers: dict, cookies=None, timeout: float = TIMEOUT,
+                 pool: int = 0, shared: bool = False):
+        self.name = name
+        self.limiter = SharedRateLimiter(name, qps) if shared else RateLimiter(qps)
+        self.sem = Gate(concurrency)
+        self.ctl: Optional[Controller] = None
+        pool = max(pool, concurrency)
+        self.client = httpx.AsyncClient(
+            headers={"Accept-Encoding": ACCEPT_ENCODING, **headers},
+            cookies=cookies,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+        )
+
+def retry_after(r: httpx.Response, default: float) -> float:
+    v = (r.headers.get("Retry-After") or "").strip()
+    if not v:
+        return default
+    try:
+        return max(0.0, float(v))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(v).timestamp() - time.time())
+    except Exception:
+        return default
+
+def decode(body: bytes, encoding: Optional[str], kind: str):
+    if kind == "json":
+        return json.loads(body)
+    if kind == "bytes":
+        return body
+    return body.decode(encoding or "utf-8", errors="replace")
+
+class Engine:
+    def __init__(self, headers: Optional[dict] = None, retries: int = RETRIES, timeout: float = TIMEOUT,
+                 cache: Optional[HttpCache] = None, metrics: Optional[Metrics] = None, adaptive: bool = False,
+                 shared_rate: bool = False, pool: Optional[ParsePool] = None):
+        self.headers = dict(headers or {})
+        self.adaptive = adaptive
+        self.shared_rate = shared_rate and SHARED_OK
+        self.retries = retries
+        self.timeout = timeout
+        self.cache = cache
+        self.pool = pool
+        self.metrics = metrics if metrics is not None else Metrics("crawl")
+        self.hosts: dict[str, Host] = {}
+
+    def host(self, netloc: str, qps: float = DEFAULT_QPS, concurrency: int = DEFAULT_CONCURRENCY,
+             headers: Optional[dict] = None, cookies=None) -> Host:
+        h = Host(netloc, qps, concurrency, {**self.headers, **(headers or {})}, cookies, self.timeout, concurrency,
+                 self.shared_rate)
+        if self.adaptive:
+            h.ctl = Controller(netloc, h.sem, h.limiter, self.metrics)
+        self.hosts[netloc] = h
+        self.metrics.track(netloc, h.limiter)
+        return h
+
+    def host_for(self, url: str) -> Host:
+        netloc = urlsplit(url).netloc
+        h = self.hosts.get(netloc)
+        return h if h is not None else self.host(netloc)
+
+    async def get(self, url: str, kind: str = "json", missing: tuple = (),
+                  cache: bool = False, cache_key: Optional[str] = None):
+        h = self.host_for(url)
+        ep = self.metrics.endpoint(h.name, url)
+        cache = cache and self.cache is not None and kind != "response"
+        key = cache_key or url
+        entry = self.cache.lookup(key) if cache else None
+        if entry is not None and entry.fresh:
+            body = entry.body()
+            if body is not None:
+                self.cache.hit(entry)
+                ep.cache_hits += 1
+                return decode(body, entry.encoding, kind)
+
+        backoff = 0.5
+        last_err = None
+        for attempt in range(self.retries):
+            if attempt:
+                ep.retries += 1
+            t1 = None
+            try:
+                t0 = time.monotonic()
+                with trace.span("wait", "wait", host=h.name):
+                    await h.sem.acquire()
+                    try:
+                        await h.limiter.acquire()
+                    except BaseException:
+                        h.sem.release()
+                        raise
+                try:
+                    t1 = time.monotonic()
+                    ep.wait += t1 - t0
+                    ep.requests += 1
+                    with trace.span("GET", "http", url=url, attempt=attempt) as sp:
+                        r = await h.client.get(url, headers=entry.validators() if entry else None)
+                        sp["status"] = r.status_code
+                finally:
+                    h.sem.release()
+                ep.observe(time.monotonic() - t1, r.status_code, len(r.content), r.num_bytes_downloaded)
+                if h.ctl is not None:
+                    h.ctl.observe(r.status_code, time.monotonic() - t1)
+
+                if r.status_code == 304 and entry is not None:
+                    body = entry.body()
+                    if body is not None:
+                        self.cache.hit(entry, revalidated=True)
+                        ep.revalidated += 1
+                        return decode(body, entry.encoding, kind)
+                    entry = None
+                    last_err = "HTTP 304 (캐시 본문 없음)"
+                    continue
+
+                if r.status_code == 401:
+                    raise AuthError(f"인증 만료: {url}")
+
+                if r.status_code >= 400 and "Retry-After" in r.headers:
+                    h.limiter.pause(retry_after(r, backoff * 2))
+
+                if r.status_code in missing:
+                    return None
+
+                if r.status_code == 429:
+                    if "Retry-After" not in r.headers:
+                        h.limiter.pause(backoff * 2)
+                    last_err = "HTTP 429"
+                    backoff = min(backoff * 2, 30)
+                    continue
+
+                if 500 <= r.status_code < 600:
+                    await asyncio.sleep(backoff)
+                    last_err = f"HTTP {r.status_code}"
+                    backoff = min(backoff * 2, 20)
+                    continue
+
+                r.raise_for_status()
+                if kind == "response":
+                    return r
+                with trace.span("decode", "decode", kind=kind, bytes=len(r.content)):
+                    out = r.json() if kind == "json" else r.content if kind == "bytes" else r.text
+                if cache:
+                    self.cache.store(key, r.content, r.headers, r.encoding)
+                return out
+
+            except AuthError:
+                raise
+            except Exception as e:
+                if isinstance(e, httpx.TimeoutException):
+                    ep.timeouts += 1
+                else:
+                    ep.errors += 1
+                if h.ctl is not None and t1 is not None:
+                    h.ctl.observe(0, time.monotonic() - t1)
+                last_err = e
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 15)
+
+        ep.failures += 1
+        raise FetchError(f"{url}: {last_err}")
+
+    def rate_report(self) -> str:
+        lines = []
+        for name, h in self.hosts.items():
+            st = h.limiter.stats()
+            lines.append(
+                f"[rate] {name} calls={st['calls']} delayed={st['delayed']} "
+                f"wait={st['wait_sec']}s max={st['max_wait_sec']}s "
+                f"pauses={st['pauses']} paused={st['paused_sec']}s"
+                + (f" conc={h.sem.limit} qps={st['qps']}" if h.ctl is not None else "")
+                + (f" share={st['share'] * 100:.0f}%/{st['members']}" if "share" in st else "")
+            )
+        if self.metrics.endpoints:
+            lines.append(self.metrics.report())
+        if self.cache is not None:
+            st = self.cache.stats()
+            lines.append(
+                f"[cache] hits={st['hits']} revalidated={st['revalidated']} "
+                f"misses={st['misses']} saved={st['saved_mb']}MB"
+            )
+        if self.pool is not None:
+            lines.append(self.pool.report())
+        return "\n".join(lines)
+
+    async def close(self):
+        for h in self.hosts.values():
+            await h.client.aclose()
+            h.limiter.close()
+        self.hosts.clear()
+        if self.pool is not None:
+            self.pool.close()
+        if self.cache is not None:
+            self.cache.close()
+        path = await self.metrics.close()
+        if path is not None:
+            print(f"[metrics] {path}")
+
+    async def __aenter__(self):
+        self.metrics.start()
+        return self
+
+    async def __aexit__(self, *a):
+        await self.close()
@@ -0,0 +1,83 @@
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+PARSER = "lxml" if etree is not None else "html.parser"
+
+SKIP_TAGS = {"script", "style", "template"}
+
+_NEXT_DATA_RE = re.compile(
+    r"<script\b[^>]*\bid=[\"']?__NEXT_DATA__[\"']?[^>]*>(.*?)</script\s*>",
+    re.S | re.I,
+)
+
+def fast() -> bool:
+    return PARSER == "lxml" and etree is not None
+
+def soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+def cut(html: str, start: str, end: str) -> str:
+    i = html.find(start)
+    j = html.rfind(end)
+    if i < 0 or j < i:
+        return html
+    return html[i:j + len(end)]
+
+def tree(html: str):
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:
+        return None
+
+def fragment(html: str):
+    try:
+        return lxml_html.fragment_fromstring(html.encode("utf-8"), create_parent="div",
+                                             parser=lxml_html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:
+        return None
+
+def cls(*names: str) -> str:
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {n} ')" for n in names)
+
+def first(el, xpath: str):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+def _strings(el, skip):
+    if el.text:
+        yield el.text
+    for c in el:
+        if isinstance(c.tag, str) and c.tag not in SKIP_TAGS and c not in skip:
+            yield from _strings(c, skip)
+        if c.tail:
+            yield c.tail
+
+def text(el, sep: str = "", strip: bool = False, skip=()) -> str:
+    skip = set(skip)
+    if strip:
+        return sep.join(s for s in (s.strip() for s in _strings(el, skip)) if s)
+    return sep.join(_strings(el, skip))
+
+def outer_html(el) -> str:
+    return lxml_html.tostring(el, encoding="unicode", with_tail=False)
+
+def html_text(html: str) -> str:
+    if fast():
+        root = fragment(html)
+        return text(root, "\n", strip=True) if root is not None else ""
+    return soup(html).get_text("\n", strip=True)
+
+def next_data(html: str) -> Optional[str]:
+    m = _NEXT_DATA_RE.search(html or "")
+    return m.group(1) if m else None
@@ -0,0 +1,177 @@
+import os
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path("./.http_cache")
+TTL = 3 * 24 * 3600
+MAX_AGE = 60 * 24 * 3600
+MAX_BYTES = 2 * 1024 ** 3
+TOUCH_BATCH = 256
+TOUCH_SEC = 5.0
+RESYNC_STORES = 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    encoding TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries(digest);
+"""
+
+class Entry:
+    def __init__(self, cache: "HttpCache", row):
+        self.cache = cache
+        self.key, self.digest, self.size, self.encoding, self.etag, self.last_modified, self.stored_at, _ = row
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.stored_at < self.cache.ttl
+
+    def validators(self) -> dict:
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+    def body(self) -> Optional[bytes]:
+        p = self.cache.blob_path(self.digest)
+        try:
+            return p.read_bytes()
+        except FileNotFoundError:
+            return None
+
+class HttpCache:
+    def __init__(self, root: Path = CACHE_DIR, ttl: float = TTL, max_age: float = MAX_AGE, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.root / "index.sqlite", timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.touched = {}
+        self.touched_at = time.monotonic()
+
+        self.total = self.total_bytes()
+        self.prune()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def lookup(self, key: str) -> Optional[Entry]:
+        row = self.db.execute("SELECT * FROM entries WHERE key=?", (key,)).fetchone()
+        return Entry(self, row) if row else None
+
+    def hit(self, e: Entry, revalidated: bool = False):
+        now = time.time()
+        if revalidated:
+            self.revalidated += 1
+            self.db.execute("UPDATE entries SET stored_at=?, accessed_at=? WHERE key=?", (now, now, e.key))
+            self.db.commit()
+        else:
+            self.hits += 1
+            self.touched[e.key] = now
+            if len(self.touched) >= TOUCH_BATCH or time.monotonic() - self.touched_at >= TOUCH_SEC:
+                self.flush()
+        self.bytes_saved += e.size
+
+    def flush(self):
+        self.touched_at = time.monotonic()
+        if not self.touched:
+            return
+        self.db.executemany("UPDATE entries SET accessed_at=? WHERE key=?", [(t, k) for k, t in self.touched.items()])
+        self.db.commit()
+        self.touched.clear()
+
+    def store(self, key: str, body: bytes, headers, encoding: Optional[str] = None):
+        self.misses += 1
+        digest = hashlib.sha256(body).hexdigest()
+        p = self.blob_path(digest)
+        if not p.exists():
+            p.parent.mkdir(exist_ok=True)
+            tmp = p.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, p)
+
+        old = self.db.execute("SELECT digest, size FROM entries WHERE key=?", (key,)).fetchone()
+        if not self.db.execute("SELECT 1 FROM entries WHERE digest=? LIMIT 1", (digest,)).fetchone():
+            self.total += len(body)
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?,?,?)",
+            (key, digest, len(body), encoding, headers.get("ETag"), headers.get("Last-Modified"), now, now),
+        )
+        self.db.commit()
+        if old and old[0] != digest:
+            self._drop_blob(*old)
+        self.evict()
+
+    def _drop_blob(self, digest: str, size: int):
+        if self.db.execute("SELECT 1 FROM entries WHERE digest=? LIMIT 1", (digest,)).fetchone():
+            return
+        self.total -= size
+        try:
+            self.blob_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _delete(self, rows):
+        for key, digest, size in rows:
+            self.db.execute("DELETE FROM entries WHERE key=?", (key,))
+            self._drop_blob(digest, size)
+        self.db.commit()
+
+    def total_bytes(self) -> int:
+        row = self.db.execute("SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM entries)").fetchone()
+        return row[0] or 0
+
+    def prune(self):
+        cutoff = time.time() - self.max_age
+        self._delete(self.db.execute("SELECT key, digest, size FROM entries WHERE stored_at < ?", (cutoff,)).fetchall())
+        self.evict()
+
+    def evict(self):
+        if self.total <= self.max_bytes and self.misses % RESYNC_STORES:
+            return
+        self.flush()
+        total = self.total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        for key, digest, size in self.db.execute("SELECT key, digest, size FROM entries ORDER BY accessed_at"):
+            victims.append((key, digest, size))
+            total -= size
+            if total <= target:
+                break
+        self._delete(victims)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "saved_mb": round(self.bytes_saved / 1024 ** 2, 2),
+        }
+
+    def close(self):
+        self.flush()
+        self.db.close()
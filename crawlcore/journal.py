@@ -0,0 +1,131 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Optional
+
+JOURNAL_DIR = Path("./.crawl_checkpoint")
+SEGMENT_BYTES = 64 * 1024 ** 2
+
+def window_key(start, end) -> str:
+    return "_".join(d.strftime("%Y%m%d") if d is not None else "open" for d in (start, end))
+
+class Journal:
+    def __init__(self, name: str, meta: dict, root: Path = JOURNAL_DIR, window: str = ""):
+        self.name = f"{name}/{window}" if window else name
+        self.dir = Path(root) / self.name
+        self.meta = json.loads(json.dumps(meta, ensure_ascii=False, default=str))
+        self.pages = {}
+        self.details = {}
+        self.readers = {}
+        self.seg = 0
+        self.f = None
+        self._load()
+
+    def _segments(self) -> list:
+        return sorted(self.dir.glob("seg-*.jsonl"))
+
+    def _load(self):
+        segs = self._segments()
+        events = []
+        for p in segs:
+            seg = int(p.stem.split("-")[1])
+            good = 0
+            with open(p, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        e = json.loads(line)
+                    except ValueError:
+                        break
+                    events.append((e, seg, good))
+                    good += len(line)
+            if good < p.stat().st_size:
+                with open(p, "r+b") as f:
+                    f.truncate(good)
+
+        if not events or events[0][0].get("t") != "meta" or events[0][0].get("meta") != self.meta:
+            if segs:
+                print(f"[journal] {self.name}: 조건이 달라 이전 기록 폐기")
+            self.clear()
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._open(1)
+            self._append({"t": "meta", "meta": self.meta})
+            return
+
+        for e, seg, off in events[1:]:
+            if e["t"] == "page":
+                self.pages[(e["k"], e["p"])] = (seg, off)
+            elif e["t"] == "detail":
+                self.details[e["id"]] = (seg, off)
+        events = None
+        self.seg = int(segs[-1].stem.split("-")[1])
+        self._open(self.seg)
+        print(f"[journal] {self.name}: 재개 (페이지 {len(self.pages)}, 상세 {len(self.details)})")
+
+    def _open(self, seg: int):
+        if self.f is not None:
+            self.f.close()
+        self.seg = seg
+        self.f = open(self.dir / f"seg-{seg:05d}.jsonl", "ab")
+
+    def _append(self, event: dict) -> tuple:
+        at = (self.seg, self.f.tell())
+        self.f.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.f.flush()
+        if self.f.tell() >= SEGMENT_BYTES:
+            self._open(self.seg + 1)
+        return at
+
+    def _read(self, at: tuple) -> dict:
+        seg, off = at
+        f = self.readers.get(seg)
+        if f is None:
+            f = self.readers[seg] = open(self.dir / f"seg-{seg:05d}.jsonl", "rb")
+        f.seek(off)
+        return json.loads(f.readline())
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.pages or self.details)
+
+    def page(self, key: str, page: int) -> Optional[dict]:
+        at = self.pages.get((key, page))
+        return self._read(at)["d"] if at is not None else None
+
+    def page_done(self, key: str, page: int, **data):
+        self.pages[(key, page)] = self._append({"t": "page", "k": key, "p": page, "d": data})
+
+    def detail(self, item_id: str) -> Optional[dict]:
+        at = self.details.get(item_id)
+        return self._read(at)["r"] if at is not None else None
+
+    def detail_done(self, item_id: str, rec: dict):
+        self.details[item_id] = self._append({"t": "detail", "id": item_id, "r": rec})
+
+    def finish(self, failed: int):
+        if not failed:
+            self.clear()
+            return
+        self.close()
+        print(f"[journal] {self.name}: 최종 실패 요청 {failed}건, 다음 실행에서 이어서 수집 ({self.dir})")
+
+    def close(self):
+        for f in self.readers.values():
+            f.close()
+        self.readers.clear()
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+    def clear(self):
+        self.close()
+        self.pages.clear()
+        self.details.clear()
+        if self.dir.exists():
+            shutil.rmtree(self.dir)
+        if "/" in self.name:
+            try:
+                self.dir.parent.rmdir()
+            except OSError:
+                pass
@@ -0,0 +1,269 @@
+import os
+import re
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit, parse_qsl
+
+METRICS_DIR = Path("./.crawl_metrics")
+EXPORT_SEC = 15.0
+TOP_ENDPOINTS = 5
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def endpoint_of(url: str) -> str:
+    u = urlsplit(url)
+    path = re.sub(r"/_next/data/[^/]+/", "/_next/data/:build/", u.path or "/")
+    path = re.sub(r"\d+", ":n", path)
+    keys = sorted({k for k, _ in parse_qsl(u.query, keep_blank_values=True)})
+    return path + ("?" + ",".join(keys) if keys else "")
+
+class Histogram:
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.n = 0
+
+    def observe(self, v: float):
+        i = 0
+        while i < len(self.buckets) and v > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += v
+        self.n += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.n:
+            return 0.0
+        rank = q * self.n
+        seen = 0
+        lo = 0.0
+        for i, c in enumerate(self.counts):
+            hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if seen + c >= rank and c:
+                return lo + (hi - lo) * (rank - seen) / c
+            seen += c
+            lo = hi
+        return self.buckets[-1]
+
+    def cumulative(self) -> list:
+        out, acc = [], 0
+        for le, c in zip(list(self.buckets) + ["+Inf"], self.counts):
+            acc += c
+            out.append((le, acc))
+        return out
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.status = {}
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.failures = 0
+        self.bytes = 0
+        self.wire_bytes = 0
+        self.cache_hits = 0
+        self.revalidated = 0
+        self.wait = 0.0
+        self.latency = Histogram()
+
+    def observe(self, seconds: float, status: int, size: int, wire: Optional[int] = None):
+        self.latency.observe(seconds)
+        self.status[status] = self.status.get(status, 0) + 1
+        self.bytes += size
+        self.wire_bytes += size if wire is None else wire
+
+    def summary(self) -> dict:
+        h = self.latency
+        return {
+            "requests": self.requests,
+            "status": {str(k): v for k, v in sorted(self.status.items())},
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "failures": self.failures,
+            "bytes": self.bytes,
+            "wire_bytes": self.wire_bytes,
+            "compression": round(self.bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+            "cache_hits": self.cache_hits,
+            "revalidated": self.revalidated,
+            "wait_sec": round(self.wait, 3),
+            "latency_sec": {
+                "count": h.n,
+                "mean": round(h.sum / h.n, 4) if h.n else 0.0,
+                "p50": round(h.quantile(0.50), 4),
+                "p90": round(h.quantile(0.90), 4),
+                "p99": round(h.quantile(0.99), 4),
+            },
+        }
+
+def _label(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Metrics:
+    def __init__(self, source: str, root: Optional[Path] = None, export_sec: float = EXPORT_SEC):
+        self.source = source
+        self.root = Path(root or METRICS_DIR)
+        self.export_sec = export_sec
+        self.started = time.time()
+        self.endpoints: dict[tuple, EndpointStats] = {}
+        self.limiters = {}
+        self.decisions = []
+        self.task: Optional[asyncio.Task] = None
+
+    def endpoint(self, host: str, url: str) -> EndpointStats:
+        key = (host, endpoint_of(url))
+        ep = self.endpoints.get(key)
+        if ep is None:
+            ep = self.endpoints[key] = EndpointStats()
+        return ep
+
+    def track(self, host: str, limiter):
+        self.limiters[host] = limiter
+
+    def decision(self, d: dict):
+        self.decisions.append(d)
+
+    def failures(self) -> int:
+        return sum(ep.failures for ep in self.endpoints.values())
+
+    def hosts(self) -> dict:
+        out = {}
+        for (host, _), ep in self.endpoints.items():
+            agg = out.setdefault(host, EndpointStats())
+            agg.requests += ep.requests
+            agg.retries += ep.retries
+            agg.timeouts += ep.timeouts
+            agg.errors += ep.errors
+            agg.failures += ep.failures
+            agg.bytes += ep.bytes
+            agg.wire_bytes += ep.wire_bytes
+            agg.cache_hits += ep.cache_hits
+            agg.revalidated += ep.revalidated
+            agg.wait += ep.wait
+            for k, v in ep.status.items():
+                agg.status[k] = agg.status.get(k, 0) + v
+            for i, c in enumerate(ep.latency.counts):
+                agg.latency.counts[i] += c
+            agg.latency.sum += ep.latency.sum
+            agg.latency.n += ep.latency.n
+        return out
+
+    def summary(self) -> dict:
+        return {
+            "source": self.source,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "elapsed_sec": round(time.time() - self.started, 3),
+            "hosts": {
+                h: {**s.summary(), "limiter": self.limiters[h].stats() if h in self.limiters else None}
+                for h, s in self.hosts().items()
+            },
+            "endpoints": {f"{h} {e}": s.summary() for (h, e), s in sorted(self.endpoints.items())},
+            "decisions": self.decisions,
+        }
+
+    def report(self) -> str:
+        lines = []
+        for h, s in self.hosts().items():
+            st = ", ".join(f"{k}:{v}" for k, v in sorted(s.status.items()))
+            lines.append(
+                f"[http] {h} req={s.requests} status={{{st}}} retries={s.retries} timeouts={s.timeouts} "
+                f"errors={s.errors} failed={s.failures} {s.wire_bytes / 1024 ** 2:.2f}/{s.bytes / 1024 ** 2:.2f}MB "
+                f"p50={s.latency.quantile(0.5) * 1000:.0f}ms p99={s.latency.quantile(0.99) * 1000:.0f}ms "
+                f"wait={s.wait:.1f}s"
+            )
+        top = sorted(self.endpoints.items(), key=lambda kv: -kv[1].wire_bytes)[:TOP_ENDPOINTS]
+        for (h, e), s in top:
+            if not s.wire_bytes:
+                continue
+            n = max(s.latency.n, 1)
+            lines.append(
+                f"[bytes] {h} {e} n={s.latency.n} wire={s.wire_bytes / 1024 ** 2:.2f}MB "
+                f"decoded={s.bytes / 1024 ** 2:.2f}MB avg={s.wire_bytes / n / 1024:.1f}/{s.bytes / n / 1024:.1f}KB"
+            )
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        src = _label(self.source)
+        counters = [
+            ("crawl_requests_total", "requests"),
+            ("crawl_retries_total", "retries"),
+            ("crawl_timeouts_total", "timeouts"),
+            ("crawl_errors_total", "errors"),
+            ("crawl_failures_total", "failures"),
+            ("crawl_bytes_total", "bytes"),
+            ("crawl_wire_bytes_total", "wire_bytes"),
+            ("crawl_cache_hits_total", "cache_hits"),
+            ("crawl_cache_revalidated_total", "revalidated"),
+            ("crawl_wait_seconds_total", "wait"),
+        ]
+        items = sorted(self.endpoints.items())
+        out = []
+        for name, attr in counters:
+            out.append(f"# TYPE {name} counter")
+            for (h, e), s in items:
+                out.append(f'{name}{{source="{src}",host="{_label(h)}",endpoint="{_label(e)}"}} {getattr(s, attr)}')
+
+        out.append("# TYPE crawl_responses_total counter")
+        for (h, e), s in items:
+            for code, n in sorted(s.status.items()):
+                out.append(f'crawl_responses_total{{source="{src}",host="{_label(h)}",endpoint="{_label(e)}",code="{code}"}} {n}')
+
+        out.append("# TYPE crawl_request_duration_seconds histogram")
+        for (h, e), s in items:
+            lab = f'source="{src}",host="{_label(h)}",endpoint="{_label(e)}"'
+            for le, acc in s.latency.cumulative():
+                out.append(f'crawl_request_duration_seconds_bucket{{{lab},le="{le}"}} {acc}')
+            out.append(f"crawl_request_duration_seconds_sum{{{lab}}} {s.latency.sum}")
+            out.append(f"crawl_request_duration_seconds_count{{{lab}}} {s.latency.n}")
+
+        out.append("# TYPE crawl_rate_paused_seconds_total counter")
+        for h, lim in sorted(self.limiters.items()):
+            out.append(f'crawl_rate_paused_seconds_total{{source="{src}",host="{_label(h)}"}} {lim.paused}')
+
+        out.append("# TYPE crawl_rate_qps gauge")
+        for h, lim in sorted(self.limiters.items()):
+            out.append(f'crawl_rate_qps{{source="{src}",host="{_label(h)}"}} {lim.qps}')
+        return "\n".join(out) + "\n"
+
+    def _write(self, path: Path, text: str):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def write_prometheus(self) -> Path:
+        path = self.root / f"{self.source}.prom"
+        self._write(path, self.prometheus())
+        return path
+
+    def write_json(self) -> Path:
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started))
+        path = self.root / f"{self.source}_{stamp}.json"
+        self._write(path, json.dumps(self.summary(), ensure_ascii=False, indent=1))
+        return path
+
+    async def _export(self):
+        while True:
+            await asyncio.sleep(self.export_sec)
+            self.write_prometheus()
+
+    def start(self):
+        if self.task is None and self.export_sec:
+            self.task = asyncio.get_running_loop().create_task(self._export())
+
+    async def close(self) -> Optional[Path]:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if not self.endpoints:
+            return None
+        self.write_prometheus()
+        return self.write_json()
@@ -0,0 +1,164 @@
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+INDEX_PATH = Path("./.crawl_state/neardup.npz")
+NUM_PERM = 128
+BANDS = 16
+SHINGLE = 5
+THRESHOLD = 0.7
+MIN_CHARS = 30
+MAX_CHARS = 20000
+SEED = 20260401
+
+_PRIME = np.uint64(4294967291)
+_MASK = np.uint64(0xFFFFFFFF)
+_MUL = np.uint64(1000003)
+_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+def normalize(text: str) -> str:
+    return _WORD_RE.sub("", (text or "").lower())[:MAX_CHARS]
+
+def shingles(text: str, k: int = SHINGLE) -> Optional[np.ndarray]:
+    s = normalize(text)
+    if len(s) < max(MIN_CHARS, k):
+        return None
+    cp = np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    n = len(cp) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = (h * _MUL + cp[j:j + n]) & _MASK
+    return np.unique(h)
+
+class NearDupIndex:
+    def __init__(self, path: Path = INDEX_PATH, num_perm: int = NUM_PERM, bands: int = BANDS,
+                 threshold: float = THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        self.path = Path(path)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rnd = np.random.default_rng(SEED)
+        self.a = rnd.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rnd.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+        self.sigs = np.zeros((1024, num_perm), dtype=np.uint32)
+        self.n = 0
+        self.keys = []
+        self.clusters = []
+        self.pos = {}
+        self.buckets = [{} for _ in range(bands)]
+        self.added = 0
+        self.dupes = 0
+        self.load()
+
+    def params(self) -> np.ndarray:
+        return np.array([self.num_perm, self.bands, SHINGLE, SEED], dtype=np.int64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        h = shingles(text)
+        if h is None:
+            return None
+        return ((self.a[:, None] * h[None, :] + self.b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _bands(self, sig: np.ndarray) -> list:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, key: str, cluster: str, sig: np.ndarray):
+        if self.n == len(self.sigs):
+            self.sigs = np.concatenate([self.sigs, np.zeros_like(self.sigs)])
+        i = self.n
+        self.sigs[i] = sig
+        self.n += 1
+        self.keys.append(key)
+        self.clusters.append(cluster)
+        self.pos[key] = i
+        for band, bk in zip(self.buckets, self._bands(sig)):
+            band.setdefault(bk, []).append(i)
+
+    def query(self, sig: np.ndarray) -> Optional[tuple[int, float]]:
+        cands = set()
+        for band, bk in zip(self.buckets, self._bands(sig)):
+            cands.update(band.get(bk, ()))
+        if not cands:
+            return None
+        idx = np.fromiter(cands, dtype=np.int64, count=len(cands))
+        sim = (self.sigs[idx] == sig).mean(axis=1)
+        best = int(sim.argmax())
+        if sim[best] < self.threshold:
+            return None
+        return int(idx[best]), float(sim[best])
+
+    def cluster_of(self, key: str) -> Optional[str]:
+        i = self.pos.get(key)
+        return self.clusters[i] if i is not None else None
+
+    def assign(self, key: str, text: str) -> tuple[Optional[str], bool]:
+        cluster = self.cluster_of(key)
+        if cluster is not None:
+            return cluster, cluster != key
+        sig = self.signature(text)
+        if sig is None:
+            return None, False
+        hit = self.query(sig)
+        cluster = self.clusters[hit[0]] if hit else key
+        self._insert(key, cluster, sig)
+        self.added += 1
+        if hit:
+            self.dupes += 1
+        return cluster, hit is not None
+
+    def tag(self, rec: dict, key: str, text_field: str, drop: tuple = (), skip: bool = False) -> bool:
+        cluster, dup = self.assign(key, rec.get(text_field) or "")
+        rec["cluster_id"] = cluster or ""
+        if dup and skip:
+            for f in (text_field,) + tuple(drop):
+                rec[f] = ""
+        return dup
+
+    def skip_fetch(self, rec: dict, key: str) -> bool:
+        cluster = self.cluster_of(key)
+        if cluster is None or cluster == key:
+            return False
+        rec["cluster_id"] = cluster
+        return True
+
+    def load(self):
+        if not self.path.exists():
+            return
+        with np.load(self.path, allow_pickle=False) as z:
+            if not np.array_equal(z["params"], self.params()):
+                print(f"[neardup] 설정이 달라 인덱스를 새로 만듭니다: {self.path}")
+                return
+            sigs, keys, clusters = z["sigs"], z["keys"].tolist(), z["clusters"].tolist()
+        for key, cluster, sig in zip(keys, clusters, sigs):
+            self._insert(key, cluster, sig)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp.npz")
+        np.savez_compressed(
+            tmp,
+            params=self.params(),
+            sigs=self.sigs[:self.n],
+            keys=np.array(self.keys, dtype=str),
+            clusters=np.array(self.clusters, dtype=str),
+        )
+        os.replace(tmp, self.path)
+
+    def report(self) -> str:
+        return f"[neardup] 색인 {self.n}건 (이번 실행 +{self.added}, 유사 중복 {self.dupes}건)"
+
+_shared = {}
+
+def shared(path: Optional[Path] = None) -> NearDupIndex:
+    path = path or INDEX_PATH
+    key = Path(path).resolve()
+    if key not in _shared:
+        _shared[key] = NearDupIndex(path)
+    return _shared[key]
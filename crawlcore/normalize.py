@@ -0,0 +1,133 @@
+import sys
+import argparse
+import importlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+TZ = "Asia/Seoul"
+REF_FIELD = "crawled_at"
+
+_ABS_RE = r"(?P<y>\d{4})[-./](?P<mo>\d{1,2})[-./](?P<d>\d{1,2})(?:[ T]+(?P<h>\d{1,2}):(?P<mi>\d{2})(?::(?P<s>\d{2}))?)?"
+_TZ_RE = r"(?:Z|[+-]\d{2}:?\d{2})$"
+_CLOCK_RE = r"^(?P<h>\d{1,2}):(?P<mi>\d{2})$"
+_AGO_RE = r"(?P<n>\d+)\s*(?P<unit>초|분|시간|일|주|개월|달|년)\s*전"
+_UNIT_SEC = {"초": 1, "분": 60, "시간": 3600, "일": 86400, "주": 7 * 86400, "개월": 30 * 86400, "달": 30 * 86400,
+             "년": 365 * 86400}
+
+def _text(s: pd.Series) -> pd.Series:
+    return s.astype("string").str.strip().replace("", pd.NA)
+
+def to_ints(s: pd.Series) -> pd.Series:
+    t = _text(s).str.replace(r"[^\d-]", "", regex=True).replace("", pd.NA)
+    return pd.to_numeric(t, errors="coerce").astype("Int64")
+
+def _assemble(parts: pd.DataFrame) -> pd.Series:
+    cols = {"year": "y", "month": "mo", "day": "d", "hour": "h", "minute": "mi", "second": "s"}
+    f = pd.DataFrame({k: pd.to_numeric(parts[v], errors="coerce") for k, v in cols.items() if v in parts})
+    for k in ("hour", "minute", "second"):
+        f[k] = f[k].fillna(0) if k in f else 0
+    return pd.to_datetime(f, errors="coerce")
+
+def to_datetimes(s: pd.Series, ref: Optional[pd.Series] = None) -> pd.Series:
+    t = _text(s)
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[us, UTC]")
+    if ref is None:
+        ref = pd.Series(pd.Timestamp.now(tz="UTC"), index=s.index)
+    ref = ref.dt.tz_convert(TZ)
+
+    aware = t.str.contains(_TZ_RE, regex=True, na=False)
+    if aware.any():
+        out[aware] = pd.to_datetime(t[aware].str.replace(" ", "T", n=1), format="ISO8601", utc=True, errors="coerce")
+
+    left = t.notna() & ~aware
+    iso = pd.to_datetime(t[left], format="ISO8601", errors="coerce").dropna()
+    if len(iso):
+        out[iso.index] = iso.dt.tz_localize(TZ, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC")
+
+    left &= out.isna()
+    parts = t[left].str.extract(_ABS_RE)
+    has = parts["y"].notna()
+    if has.any():
+        local = _assemble(parts[has]).dt.tz_localize(TZ, ambiguous="NaT", nonexistent="NaT")
+        out[local.index] = local.dt.tz_convert("UTC")
+
+    left &= out.isna()
+    clock = t[left].str.extract(_CLOCK_RE).dropna()
+    if len(clock):
+        day = ref[clock.index].dt.normalize()
+        secs = clock["h"].astype(int) * 3600 + clock["mi"].astype(int) * 60
+        out[clock.index] = (day + pd.to_timedelta(secs, unit="s")).dt.tz_convert("UTC")
+
+    left &= out.isna()
+    ago = t[left].str.extract(_AGO_RE).dropna()
+    if len(ago):
+        secs = ago["n"].astype(np.int64) * ago["unit"].map(_UNIT_SEC).astype(np.int64)
+        out[ago.index] = (ref[ago.index] - pd.to_timedelta(secs, unit="s")).dt.tz_convert("UTC")
+
+    left &= out.isna()
+    words = t[left]
+    if len(words):
+        for word, days in (("방금", None), ("오늘", 0), ("어제", 1), ("그제", 2)):
+            hit = words.str.contains(word, regex=False, na=False)
+            if hit.any():
+                base = ref[hit[hit].index]
+                if days is not None:
+                    base = base.dt.normalize() - pd.Timedelta(days=days)
+                out[base.index] = base.dt.tz_convert("UTC")
+    return out
+
+def to_categories(s: pd.Series) -> pd.Series:
+    return _text(s).astype("category")
+
+def normalize(df: pd.DataFrame, types: dict, ref_field: str = REF_FIELD) -> pd.DataFrame:
+    out = df.copy()
+    ref = None
+    if ref_field in out.columns and types.get(ref_field) == "datetime":
+        out[ref_field] = to_datetimes(out[ref_field])
+        ref = out[ref_field].fillna(pd.Timestamp.now(tz="UTC"))
+    for col, kind in types.items():
+        if col not in out.columns or col == ref_field and ref is not None:
+            continue
+        if kind == "int":
+            out[col] = to_ints(out[col])
+        elif kind == "datetime":
+            out[col] = to_datetimes(out[col], ref)
+        elif kind == "category":
+            out[col] = to_categories(out[col])
+    for col in out.columns:
+        if col not in types:
+            out[col] = out[col].astype("string")
+    return out
+
+def frame(records: list, columns: list, types: dict) -> pd.DataFrame:
+    return normalize(pd.DataFrame.from_records(records, columns=columns), types)
+
+def read_raw(path: Path) -> pd.DataFrame:
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+def load(path: Path, source: str) -> pd.DataFrame:
+    return normalize(read_raw(path), importlib.import_module(source).PARQUET_TYPES)
+
+def main():
+    ap = argparse.ArgumentParser(description="CSV/JSONL 결과를 타입이 있는 Parquet 으로 변환")
+    ap.add_argument("source", choices=["okky", "careerly", "itunion"])
+    ap.add_argument("files", nargs="+", type=Path)
+    ap.add_argument("-o", "--out-dir", type=Path, help="기본: 입력 파일과 같은 폴더")
+    args = ap.parse_args()
+
+    for f in args.files:
+        df = load(f, args.source)
+        out = (args.out_dir or f.parent) / (f.stem + ".parquet")
+        out.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(out, index=False)
+        print(f"{f} -> {out} ({len(df)}건)")
+        print(df.dtypes.to_string(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
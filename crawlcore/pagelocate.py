@@ -0,0 +1,74 @@
+from datetime import date
+from typing import Awaitable, Callable, Optional
+
+PAGE_MARGIN = 1
+MAX_GALLOP = 1 << 16
+
+class PageLocator:
+    def __init__(self, fetch: Callable[[int], Awaitable], dates: Callable[[object], list], first_page: int = 1):
+        self.fetch = fetch
+        self.dates = dates
+        self.first = first_page
+        self.cache = {}
+        self.probes = 0
+
+    def seed(self, page: int, data):
+        self.cache[page] = data
+
+    async def page(self, page: int):
+        if page not in self.cache:
+            self.cache[page] = await self.fetch(page)
+            self.probes += 1
+        return self.cache[page]
+
+    def take(self, page: int):
+        return self.cache.pop(page, None)
+
+    async def span(self, page: int) -> Optional[tuple[date, date]]:
+        data = await self.page(page)
+        ds = [d for d in (self.dates(data) if data is not None else []) if d is not None]
+        return (max(ds), min(ds)) if ds else None
+
+    async def _first_true(self, lo: int, hi: int, pred) -> int:
+        ans = hi + 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if pred(await self.span(mid)):
+                ans, hi = mid, mid - 1
+            else:
+                lo = mid + 1
+        return ans
+
+    async def _last_true(self, lo: int, hi: int, pred) -> int:
+        ans = lo - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if pred(await self.span(mid)):
+                ans, lo = mid, mid + 1
+            else:
+                hi = mid - 1
+        return ans
+
+    async def locate(self, last_page: int, start: Optional[date], end: Optional[date],
+                     open_ended: bool = False) -> tuple[int, int]:
+        def reaches_end(s):
+            return s is None or s[1] <= end
+
+        def reaches_start(s):
+            return s is not None and s[0] >= start
+
+        if open_ended and start is not None:
+            while last_page < MAX_GALLOP and reaches_start(await self.span(last_page)):
+                last_page *= 2
+
+        lo = self.first
+        if end is not None:
+            lo = await self._first_true(self.first, last_page, reaches_end)
+
+        hi = last_page
+        if start is not None:
+            hi = await self._last_true(lo, last_page, reaches_start)
+
+        if hi < lo:
+            return lo, lo - 1
+        return max(self.first, lo - PAGE_MARGIN), min(last_page, hi + PAGE_MARGIN)
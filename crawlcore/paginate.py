@@ -0,0 +1,39 @@
+import asyncio
+import inspect
+from collections import deque
+from typing import Awaitable, Callable, Iterable, Union
+
+WINDOW = 4
+
+async def paginate(pages: Iterable[int], fetch: Callable[[int], Awaitable],
+                   consume: Callable[[int, object], Union[bool, Awaitable[bool]]], window: int = WINDOW) -> int:
+    it = iter(pages)
+    inflight = deque()
+    done = 0
+
+    def fill():
+        while len(inflight) < max(1, window):
+            p = next(it, None)
+            if p is None:
+                return
+            inflight.append((p, asyncio.ensure_future(fetch(p))))
+
+    try:
+        fill()
+        while inflight:
+            p, task = inflight[0]
+            result = await task
+            inflight.popleft()
+            done += 1
+            stop = consume(p, result)
+            if inspect.isawaitable(stop):
+                stop = await stop
+            if stop:
+                break
+            fill()
+    finally:
+        for _, task in inflight:
+            task.cancel()
+        if inflight:
+            await asyncio.gather(*(t for _, t in inflight), return_exceptions=True)
+    return done
@@ -0,0 +1,124 @@
+import os
+import sys
+import asyncio
+import importlib
+import multiprocessing
+from pathlib import PurePath
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from crawlcore import trace
+
+BATCH = 16
+BATCH_MS = 5.0
+SETTING_TYPES = (str, int, float, bool, type(None), tuple, list, dict, set, PurePath, date)
+
+def _init(settings: dict):
+    for module, values in settings.items():
+        mod = sys.modules.get(module) or importlib.import_module(module)
+        for k, v in values.items():
+            setattr(mod, k, v)
+
+def _run(fn: Callable, items: list) -> list:
+    out = []
+    for args in items:
+        try:
+            out.append((True, fn(*args)))
+        except Exception as e:
+            out.append((False, e))
+    return out
+
+class ParsePool:
+    def __init__(self, procs: int, settings: Optional[dict] = None, batch: int = BATCH, batch_ms: float = BATCH_MS):
+        self.procs = max(0, procs)
+        self.batch = max(1, batch)
+        self.batch_ms = batch_ms
+        self.ex = None
+        if self.procs:
+            self.ex = ProcessPoolExecutor(self.procs, mp_context=multiprocessing.get_context("spawn"),
+                                          initializer=_init, initargs=(settings or {},))
+        self.pending = {}
+        self.timer = None
+        self.calls = 0
+        self.batches = 0
+        self.failed = 0
+
+    async def run(self, fn: Callable, *args):
+        if self.ex is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        q = self.pending.setdefault(fn, [])
+        q.append((args, fut))
+        self.calls += 1
+        if len(q) >= self.batch:
+            self._flush(fn)
+        elif self.timer is None:
+            self.timer = loop.call_later(self.batch_ms / 1000, self._flush_all)
+        with trace.span(f"{fn.__module__}.{fn.__name__}", "parse", pool=True):
+            return await fut
+
+    async def map(self, fn: Callable, items: list) -> list:
+        return await asyncio.gather(*(self.run(fn, x) for x in items))
+
+    def _flush_all(self):
+        self.timer = None
+        for fn in list(self.pending):
+            self._flush(fn)
+
+    def _flush(self, fn: Callable):
+        items = self.pending.pop(fn, None)
+        if not items:
+            return
+        self.batches += 1
+        cf = asyncio.get_running_loop().run_in_executor(self.ex, _run, fn, [a for a, _ in items])
+        cf.add_done_callback(lambda f: self._deliver(items, f))
+
+    def _deliver(self, items: list, f: asyncio.Future):
+        if f.cancelled():
+            for _, fut in items:
+                fut.cancel()
+            return
+        err = f.exception()
+        results = [(False, err)] * len(items) if err is not None else f.result()
+        for (_, fut), (ok, val) in zip(items, results):
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(val)
+            else:
+                self.failed += 1
+                fut.set_exception(val)
+
+    def report(self) -> str:
+        if not self.procs:
+            return "[parse] inline"
+        avg = self.calls / self.batches if self.batches else 0
+        return f"[parse] procs={self.procs} calls={self.calls} batches={self.batches} avg_batch={avg:.1f} failed={self.failed}"
+
+    def close(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        for fn in list(self.pending):
+            for _, fut in self.pending.pop(fn):
+                fut.cancel()
+        if self.ex is not None:
+            self.ex.shutdown(wait=True, cancel_futures=True)
+            self.ex = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        self.close()
+
+def settings(*modules: str) -> dict:
+    return {
+        m: {k: v for k, v in vars(sys.modules[m]).items() if k.isupper() and isinstance(v, SETTING_TYPES)}
+        for m in modules
+    }
+
+def procs(n: Optional[int]) -> int:
+    return max(0, (os.cpu_count() or 1) - 1) if n is None else max(0, n)
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from crawlcore.sink import SeenSet
+
+QUEUE_PER_WORKER = 4
+
+class Pipeline:
+    def __init__(self, work: Callable[[dict], Awaitable], emit: Callable[[object], None], workers: int,
+                 key: Optional[Callable[[dict], str]] = None, maxsize: int = 0):
+        self.work = work
+        self.emit = emit
+        self.workers = max(1, workers)
+        self.key = key
+        self.queue = asyncio.Queue(maxsize or self.workers * QUEUE_PER_WORKER)
+        self.seen = SeenSet()
+        self.tasks = []
+        self.queued = 0
+        self.dupes = 0
+        self.done = 0
+        self.failed = 0
+        self.error = None
+
+    async def put(self, item: dict) -> bool:
+        if self.error is not None:
+            raise self.error
+        if self.key is not None:
+            k = self.key(item)
+            if k and not self.seen.add(k):
+                self.dupes += 1
+                return False
+        self.queued += 1
+        await self.queue.put(item)
+        return True
+
+    async def put_many(self, items) -> int:
+        n = 0
+        for item in items:
+            n += await self.put(item)
+        return n
+
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                if item is None:
+                    return
+                try:
+                    out = await self.work(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[pipeline] 처리 실패: {e!r}")
+                    continue
+                try:
+                    self.emit(out)
+                except Exception as e:
+                    print(f"[pipeline] 저장 실패, 중단: {e!r}")
+                    self._abort(e)
+                    raise
+                self.done += 1
+            finally:
+                self.queue.task_done()
+
+    def _abort(self, e: Exception):
+        if self.error is None:
+            self.error = e
+        me = asyncio.current_task()
+        for t in self.tasks:
+            if t is not me:
+                t.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+    async def __aenter__(self):
+        name = getattr(self.work, "__name__", "worker")
+        self.tasks = [asyncio.create_task(self._worker(), name=f"{name}-{i}") for i in range(self.workers)]
+        return self
+
+    async def __aexit__(self, exc_type, *a):
+        if exc_type is None and self.error is None:
+            for _ in self.tasks:
+                await self.queue.put(None)
+        else:
+            for t in self.tasks:
+                t.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if exc_type is None and self.error is not None:
+            raise self.error
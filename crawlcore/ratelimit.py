@@ -0,0 +1,206 @@
+import os
+import re
+import json
+import time
+import socket
+import asyncio
+from pathlib import Path
+from typing import Optional
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+RATE_DIR = Path("./.crawl_state/rate")
+STALE_SEC = 60.0
+SHARED_OK = fcntl is not None or msvcrt is not None
+
+def _lock(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            pass
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return
+    f.seek(0)
+    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class RateLimiter:
+    def __init__(self, qps: float, burst: float = 0):
+        self.qps = qps
+        self.burst = burst or max(1.0, qps)
+        self.tat = time.monotonic()
+        self.paused_until = 0.0
+        self.shift = 0.0
+
+        self.calls = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.pauses = 0
+        self.paused = 0.0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.qps
+
+    @property
+    def tau(self) -> float:
+        return (self.burst - 1) * self.interval
+
+    def reserve(self) -> tuple[float, float]:
+        now = time.monotonic()
+        tat = max(self.tat, now, self.paused_until)
+        when = max(now, tat - self.tau, self.paused_until)
+        self.tat = tat + self.interval
+        return when, self.shift
+
+    def pause(self, seconds: float):
+        now = time.monotonic()
+        until = now + seconds
+        delta = until - max(now, self.paused_until)
+        if delta <= 0:
+            return
+        self.pauses += 1
+        self.paused += delta
+        self.shift += delta
+        self.paused_until = until
+        self.tat = max(self.tat + delta, until + self.tau)
+
+    def refund(self):
+        self.tat -= self.interval
+
+    def sync(self):
+        pass
+
+    async def acquire(self):
+        t0 = time.monotonic()
+        when, shift = self.reserve()
+        try:
+            while True:
+                self.sync()
+                now = time.monotonic()
+                target = when + (self.shift - shift)
+                if target <= now:
+                    break
+                await asyncio.sleep(target - now)
+        except asyncio.CancelledError:
+            self.refund()
+            raise
+
+        w = time.monotonic() - t0
+        self.calls += 1
+        if w > 0.001:
+            self.delayed += 1
+            self.waited += w
+            self.max_wait = max(self.max_wait, w)
+
+    def stats(self) -> dict:
+        return {
+            "qps": round(self.qps, 2),
+            "calls": self.calls,
+            "delayed": self.delayed,
+            "wait_sec": round(self.waited, 3),
+            "avg_wait_sec": round(self.waited / self.calls, 4) if self.calls else 0.0,
+            "max_wait_sec": round(self.max_wait, 3),
+            "pauses": self.pauses,
+            "paused_sec": round(self.paused, 3),
+        }
+
+    def close(self):
+        pass
+
+class SharedRateLimiter(RateLimiter):
+    def __init__(self, name: str, qps: float, burst: float = 0, root: Optional[Path] = None):
+        super().__init__(qps, burst)
+        self.name = name
+        self.member = f"{socket.gethostname()}:{os.getpid()}"
+        self.offset = time.time() - time.monotonic()
+        root = Path(root or RATE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = root / (re.sub(r"[^\w.-]", "_", name) + ".json")
+        self.f = open(self.path, "a+", encoding="utf-8")
+        self.reserved = 0
+        self.share = 1.0
+        self.members = 1
+
+    @contextmanager
+    def _locked(self, write: bool = True):
+        _lock(self.f)
+        try:
+            self.f.seek(0)
+            try:
+                st = json.loads(self.f.read() or "{}")
+            except ValueError:
+                st = {}
+            if "tat" in st:
+                self.tat = st["tat"] - self.offset
+                self.paused_until = st["paused_until"] - self.offset
+                self.shift = st["shift"]
+            yield
+
+            now = time.time()
+            members = {k: v for k, v in st.get("members", {}).items() if now - v["seen"] < STALE_SEC}
+            members[self.member] = {
+                "reserved": self.reserved, "calls": self.calls, "wait_sec": round(self.waited, 3),
+                "qps": self.qps, "seen": now,
+            }
+            total = sum(m.get("reserved", 0) for m in members.values())
+            self.share = self.reserved / total if total else 1.0 / len(members)
+            self.members = len(members)
+            if not write:
+                return
+            self.f.seek(0)
+            self.f.truncate()
+            json.dump({
+                "tat": self.tat + self.offset, "paused_until": self.paused_until + self.offset,
+                "shift": self.shift, "members": members,
+            }, self.f)
+            self.f.flush()
+        finally:
+            _unlock(self.f)
+
+    def reserve(self) -> tuple[float, float]:
+        with self._locked():
+            self.reserved += 1
+            return super().reserve()
+
+    def pause(self, seconds: float):
+        with self._locked():
+            super().pause(seconds)
+
+    def refund(self):
+        with self._locked():
+            self.reserved -= 1
+            super().refund()
+
+    def sync(self):
+        with self._locked(write=False):
+            pass
+
+    def stats(self) -> dict:
+        if not self.f.closed:
+            self.sync()
+        return {**super().stats(), "share": round(self.share, 3), "members": self.members}
+
+    def close(self):
+        if self.f.closed:
+            return
+        with self._locked():
+            pass
+        self.f.close()
@@ -0,0 +1,124 @@
+import os
+import csv
+import json
+import time
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Optional
+
+FLUSH_SEC = 1.0
+
+class SeenSet:
+    def __init__(self, capacity: int = 1 << 16):
+        self.table = array("Q", bytes(8 * capacity))
+        self.mask = capacity - 1
+        self.n = 0
+
+    @staticmethod
+    def digest(key) -> int:
+        h = int.from_bytes(hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest(), "little")
+        return h or 1
+
+    def _insert(self, h: int) -> bool:
+        i = h & self.mask
+        while True:
+            v = self.table[i]
+            if v == 0:
+                self.table[i] = h
+                self.n += 1
+                return True
+            if v == h:
+                return False
+            i = (i + 1) & self.mask
+
+    def _grow(self):
+        old = self.table
+        self.table = array("Q", bytes(16 * len(old)))
+        self.mask = len(self.table) - 1
+        self.n = 0
+        for h in old:
+            if h:
+                self._insert(h)
+
+    def add(self, key) -> bool:
+        if 2 * (self.n + 1) > len(self.table):
+            self._grow()
+        return self._insert(self.digest(key))
+
+    def __contains__(self, key) -> bool:
+        h = self.digest(key)
+        i = h & self.mask
+        while True:
+            v = self.table[i]
+            if v == 0:
+                return False
+            if v == h:
+                return True
+            i = (i + 1) & self.mask
+
+    def __len__(self):
+        return self.n
+
+class RecordSink:
+    def __init__(self, path: Path, columns: list, key: Optional[str] = None):
+        self.path = Path(path)
+        self.part = self.path.with_name(self.path.name + ".part")
+        self.columns = list(columns)
+        self.key = key
+        self.seen = SeenSet()
+        self.count = 0
+        self.dupes = 0
+        self.jsonl = self.path.suffix == ".jsonl"
+        self.f = open(self.part, "w", encoding="utf-8" if self.jsonl else "utf-8-sig", newline="")
+        self.w = None
+        if not self.jsonl:
+            self.w = csv.DictWriter(self.f, fieldnames=self.columns, extrasaction="ignore")
+            self.w.writeheader()
+        self.last_flush = time.monotonic()
+
+    def write(self, rec: dict) -> bool:
+        if self.key:
+            k = rec.get(self.key)
+            if k and not self.seen.add(k):
+                self.dupes += 1
+                return False
+        if self.jsonl:
+            self.f.write(json.dumps({c: rec.get(c, "") for c in self.columns}, ensure_ascii=False) + "\n")
+        else:
+            self.w.writerow(rec)
+        self.count += 1
+        if time.monotonic() - self.last_flush >= FLUSH_SEC:
+            self.flush()
+        return True
+
+    def write_many(self, recs) -> int:
+        n = sum(1 for r in recs if self.write(r))
+        self.flush()
+        return n
+
+    def flush(self):
+        self.f.flush()
+        self.last_flush = time.monotonic()
+
+    def finalize(self) -> Optional[Path]:
+        self.f.close()
+        if not self.count:
+            self.part.unlink()
+            return None
+        os.replace(self.part, self.path)
+        return self.path
+
+    def abort(self):
+        if not self.f.closed:
+            self.f.close()
+        print(f"중단: 부분 결과 {self.part} ({self.count}건)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *a):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
@@ -0,0 +1,238 @@
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Optional
+
+from crawlcore import trace
+
+STORE_PATH = Path("./crawl.sqlite")
+COMMIT_ROWS = 500
+
+META = """
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    key_col TEXT NOT NULL,
+    title_col TEXT NOT NULL,
+    body_col TEXT NOT NULL,
+    author_col TEXT,
+    url_col TEXT
+);
+"""
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _tokenizer(db) -> str:
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp._probe USING fts5(x, tokenize='trigram')")
+        db.execute("DROP TABLE temp._probe")
+        return "trigram"
+    except sqlite3.OperationalError:
+        return "unicode61"
+
+def utc_times(values: list) -> list:
+    import pandas as pd
+    from crawlcore.normalize import to_datetimes
+
+    ts = to_datetimes(pd.Series(values, dtype=object))
+    return [None if pd.isna(t) else t.isoformat() for t in ts]
+
+def utc_bound(d, days: int = 0) -> str:
+    (s,) = utc_times([d.isoformat() if isinstance(d, datetime) else f"{d}T00:00"])
+    if s is None:
+        raise ValueError(f"날짜 형식 오류: {d!r}")
+    return (datetime.fromisoformat(s) + timedelta(days=days)).isoformat()
+
+class Store:
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(META)
+        self.tokenizer = _tokenizer(self.db)
+
+    def register(self, name: str, columns: list, key: str, title: str, body: str,
+                 author: Optional[str] = None, url: Optional[str] = None):
+        cols = list(dict.fromkeys([key] + list(columns)))
+        t, f = _q(name), _q(f"{name}_fts")
+        defs = ", ".join(f"{_q(c)} TEXT" for c in cols if c != key)
+        self.db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {t} (
+                {_q(key)} TEXT PRIMARY KEY,
+                {defs},
+                created_ts TEXT
+            );
+            CREATE INDEX IF NOT EXISTS {_q(f"{name}_created")} ON {t}(created_ts);
+            CREATE VIRTUAL TABLE IF NOT EXISTS {f} USING fts5(
+                title, body, content='', tokenize='{self.tokenizer}'
+            );
+            CREATE TRIGGER IF NOT EXISTS {_q(f"{name}_ai")} AFTER INSERT ON {t} BEGIN
+                INSERT INTO {f}(rowid, title, body) VALUES (new.rowid, new.{_q(title)}, new.{_q(body)});
+            END;
+            CREATE TRIGGER IF NOT EXISTS {_q(f"{name}_ad")} AFTER DELETE ON {t} BEGIN
+                INSERT INTO {f}({f}, rowid, title, body) VALUES ('delete', old.rowid, old.{_q(title)}, old.{_q(body)});
+            END;
+            CREATE TRIGGER IF NOT EXISTS {_q(f"{name}_au")} AFTER UPDATE ON {t} BEGIN
+                INSERT INTO {f}({f}, rowid, title, body) VALUES ('delete', old.rowid, old.{_q(title)}, old.{_q(body)});
+                INSERT INTO {f}(rowid, title, body) VALUES (new.rowid, new.{_q(title)}, new.{_q(body)});
+            END;
+        """)
+        have = {r[1] for r in self.db.execute(f"PRAGMA table_info({t})")}
+        for c in cols:
+            if c not in have:
+                self.db.execute(f"ALTER TABLE {t} ADD COLUMN {_q(c)} TEXT")
+        self.db.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?,?,?,?,?,?)",
+            (name, key, title, body, author, url),
+        )
+        self._rebuild_view()
+        self.db.commit()
+
+    def _rebuild_view(self):
+        parts = []
+        for name, key, title, body, author, url in self.db.execute("SELECT * FROM sources ORDER BY name"):
+            parts.append(
+                f"SELECT '{name}' AS source, {_q(key)} AS id, {_q(title)} AS title, {_q(body)} AS body, "
+                f"{_q(author) if author else 'NULL'} AS author, {_q(url) if url else 'NULL'} AS url, "
+                f"created_ts FROM {_q(name)}"
+            )
+        self.db.execute("DROP VIEW IF EXISTS all_posts")
+        if parts:
+            self.db.execute("CREATE VIEW all_posts AS " + " UNION ALL ".join(parts))
+
+    def upsert_many(self, name: str, recs: list, columns: list, key: str, date_field: str,
+                    keep_nonempty: tuple = ()):
+        if not recs:
+            return
+        cols = list(dict.fromkeys([key] + list(columns)))
+        rows = [[None if rec.get(c) is None else str(rec.get(c)) for c in cols] + [ts]
+                for rec, ts in zip(recs, utc_times([rec.get(date_field) for rec in recs]))]
+        sets = []
+        for c in cols[1:] + ["created_ts"]:
+            if c in keep_nonempty:
+                sets.append(f"{_q(c)}=COALESCE(NULLIF(excluded.{_q(c)}, ''), {_q(c)})")
+            else:
+                sets.append(f"{_q(c)}=excluded.{_q(c)}")
+        self.db.executemany(
+            f"INSERT INTO {_q(name)} ({', '.join(_q(c) for c in cols)}, created_ts) "
+            f"VALUES ({', '.join('?' * (len(cols) + 1))}) "
+            f"ON CONFLICT({_q(key)}) DO UPDATE SET {', '.join(sets)}",
+            rows,
+        )
+
+    def source(self, name: str) -> tuple:
+        row = self.db.execute("SELECT key_col, title_col, body_col FROM sources WHERE name=?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row
+
+    def has_body(self, name: str, item_id) -> bool:
+        key, _, body = self.source(name)
+        row = self.db.execute(
+            f"SELECT 1 FROM {_q(name)} WHERE {_q(key)}=? AND COALESCE({_q(body)}, '') != ''",
+            (str(item_id),),
+        ).fetchone()
+        return row is not None
+
+    def search(self, query: str, source: Optional[str] = None, start=None, end=None, limit: int = 50) -> list:
+        names = [source] if source else [r[0] for r in self.db.execute("SELECT name FROM sources ORDER BY name")]
+        out = []
+        for name in names:
+            key, title, body = self.source(name)
+            terms = query.split()
+            if self.tokenizer == "trigram" and any(len(w) < 3 for w in terms):
+                sql = (
+                    f"SELECT '{name}', t.{_q(key)}, t.{_q(title)}, t.created_ts, 0 AS rank FROM {_q(name)} t WHERE "
+                    + " AND ".join(f"(t.{_q(title)} LIKE ? OR t.{_q(body)} LIKE ?)" for _ in terms)
+                )
+                args = [a for w in terms for a in (f"%{w}%", f"%{w}%")]
+            else:
+                sql = (
+                    f"SELECT '{name}', t.{_q(key)}, t.{_q(title)}, t.created_ts, bm25({_q(name + '_fts')}) AS rank "
+                    f"FROM {_q(name + '_fts')} f JOIN {_q(name)} t ON t.rowid = f.rowid "
+                    f"WHERE {_q(name + '_fts')} MATCH ?"
+                )
+                args = [fts_query(query)]
+            if start is not None:
+                sql += " AND t.created_ts >= ?"
+                args.append(utc_bound(start))
+            if end is not None:
+                sql += " AND t.created_ts < ?"
+                args.append(utc_bound(end, days=1))
+            sql += " ORDER BY rank LIMIT ?"
+            args.append(limit)
+            out.extend(self.db.execute(sql, args).fetchall())
+        return sorted(out, key=lambda r: r[4])[:limit]
+
+    @trace.traced("save")
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def fts_query(q: str) -> str:
+    return " ".join('"' + w.replace('"', '""') + '"' for w in q.split())
+
+class StoreSink:
+    def __init__(self, name: str, columns: list, key: str, title: str, body: str, date_field: str,
+                 author: Optional[str] = None, url: Optional[str] = None, store: Optional[Store] = None):
+        self.store = store or Store()
+        self.own = store is None
+        self.name = name
+        self.columns = list(columns)
+        self.key = key
+        self.body = body
+        self.date_field = date_field
+        self.path = self.store.path
+        self.count = 0
+        self.rows = []
+        self.bodies = set()
+        self.store.register(name, self.columns, key, title, body, author, url)
+
+    def known(self, item_id) -> bool:
+        return str(item_id) in self.bodies or self.store.has_body(self.name, item_id)
+
+    def write(self, rec: dict) -> bool:
+        if not rec.get(self.key):
+            return False
+        self.rows.append(rec)
+        if rec.get(self.body):
+            self.bodies.add(str(rec[self.key]))
+        self.count += 1
+        if len(self.rows) >= COMMIT_ROWS:
+            self.flush()
+        return True
+
+    def write_many(self, recs) -> int:
+        n = sum(1 for r in recs if self.write(r))
+        self.flush()
+        return n
+
+    def flush(self):
+        self.store.upsert_many(self.name, self.rows, self.columns, self.key, self.date_field,
+                               keep_nonempty=(self.body,))
+        self.store.commit()
+        self.rows.clear()
+        self.bodies.clear()
+
+    def finalize(self):
+        self.flush()
+        if self.own:
+            self.store.close()
+        return self.path if self.count else None
+
+    def abort(self):
+        self.finalize()
+        print(f"중단: {self.path} 에 {self.count}건까지 저장")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *a):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
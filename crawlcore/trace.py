@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import inspect
+import functools
+import threading
+from pathlib import Path
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+PROFILE_DIR = Path("./.crawl_profile")
+SAMPLE_MS = 5.0
+MAX_EVENTS = 500_000
+
+_STAGES = {}
+_NULL = nullcontext({})
+_tracer = None
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class Tracer:
+    def __init__(self, name: str, root: Optional[Path] = None, sample: bool = True):
+        self.name = name
+        self.root = Path(root or PROFILE_DIR)
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.events = []
+        self.dropped = 0
+        self.tids = {}
+        self.totals = {}
+        self.samples = {}
+        self.main = threading.main_thread().ident
+        self.stopping = threading.Event()
+        self.sampler = None
+        if sample:
+            self.sampler = threading.Thread(target=self._sample, name="trace-sampler", daemon=True)
+            self.sampler.start()
+
+    def worker(self) -> tuple[int, str]:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        who = task.get_name() if task is not None else threading.current_thread().name
+        tid = self.tids.get(who)
+        if tid is None:
+            tid = self.tids[who] = len(self.tids) + 1
+            self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": who}})
+        return tid, who
+
+    def add(self, name: str, cat: str, start: float, dur: float, args: dict):
+        n, sec = self.totals.get(cat, (0, 0.0))
+        self.totals[cat] = (n + 1, sec + dur)
+        if len(self.events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        tid, who = self.worker()
+        self.events.append({
+            "name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+            "ts": round((start - self.t0) * 1e6, 1), "dur": round(dur * 1e6, 1), "args": {**args, "worker": who},
+        })
+
+    def _sample(self):
+        me = threading.get_ident()
+        names = {}
+        while not self.stopping.wait(SAMPLE_MS / 1000):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                stage = None
+                f = frame
+                while f is not None:
+                    stack.append(f.f_code)
+                    if stage is None:
+                        stage = _STAGES.get(f.f_code)
+                    f = f.f_back
+                if stage is None:
+                    if ident != self.main:
+                        continue
+                    stage = "idle" if frame.f_code.co_name in ("select", "poll", "epoll") else "other"
+                if ident not in names:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                    names.setdefault(ident, str(ident))
+                key = ";".join([stage, names[ident]] + [_frame_label(c) for c in reversed(stack)])
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def write(self) -> list:
+        self.root.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started))
+        base = self.root / f"{self.name}_{stamp}_{self.pid}"
+        paths = [base.with_suffix(".trace.json")]
+        paths[0].write_text(json.dumps({
+            "traceEvents": self.events, "displayTimeUnit": "ms",
+            "otherData": {"source": self.name, "dropped": self.dropped, "sample_ms": SAMPLE_MS},
+        }, ensure_ascii=False), encoding="utf-8")
+
+        by_stage = {}
+        for key, n in self.samples.items():
+            by_stage.setdefault(key.split(";", 1)[0], []).append(f"{key} {n}")
+        if by_stage:
+            p = base.with_suffix(".folded")
+            p.write_text("\n".join(line for lines in by_stage.values() for line in lines) + "\n", encoding="utf-8")
+            paths.append(p)
+            for stage, lines in sorted(by_stage.items()):
+                p = base.with_name(f"{base.name}.{stage}.folded")
+                p.write_text("\n".join(line.split(";", 1)[1] for line in lines) + "\n", encoding="utf-8")
+                paths.append(p)
+        return paths
+
+    def report(self) -> str:
+        cpu = {}
+        for key, n in self.samples.items():
+            stage = key.split(";", 1)[0]
+            cpu[stage] = cpu.get(stage, 0) + n
+        lines = []
+        for cat in sorted(set(self.totals) | set(cpu), key=lambda c: -self.totals.get(c, (0, 0.0))[1]):
+            n, sec = self.totals.get(cat, (0, 0.0))
+            lines.append(
+                f"[profile] {cat:8s} spans={n:<6d} total={sec:8.2f}s avg={sec / n * 1000 if n else 0:7.1f}ms "
+                f"sampled={cpu.get(cat, 0) * SAMPLE_MS / 1000:.2f}s"
+            )
+        if self.dropped:
+            lines.append(f"[profile] 이벤트 {self.dropped}건은 MAX_EVENTS 초과로 버림")
+        return "\n".join(lines)
+
+    def close(self) -> list:
+        self.stopping.set()
+        if self.sampler is not None:
+            self.sampler.join()
+        return self.write()
+
+def start(name: str, root: Optional[Path] = None, sample: bool = True) -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(name, root, sample)
+    return _tracer
+
+def stop() -> list:
+    global _tracer
+    t, _tracer = _tracer, None
+    if t is None:
+        return []
+    paths = t.close()
+    print(t.report())
+    for p in paths:
+        print(f"[profile] {p}")
+    return paths
+
+def active() -> bool:
+    return _tracer is not None
+
+@contextmanager
+def _span(t: Tracer, name: str, cat: str, args: dict):
+    s = time.perf_counter()
+    try:
+        yield args
+    finally:
+        t.add(name, cat, s, time.perf_counter() - s, args)
+
+def span(name: str, cat: str = "", **args):
+    t = _tracer
+    if t is None:
+        return _NULL
+    return _span(t, name, cat, args)
+
+def _args(fn, a) -> dict:
+    out = {"source": fn.__module__}
+    if a and (isinstance(a[0], int) or isinstance(a[0], str) and len(a[0]) <= 64):
+        out["arg"] = a[0]
+    return out
+
+def traced(cat: str, name: Optional[str] = None):
+    def deco(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+        _STAGES[fn.__code__] = cat
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrap(*a, **kw):
+                t = _tracer
+                if t is None:
+                    return await fn(*a, **kw)
+                with _span(t, label, cat, _args(fn, a)):
+                    return await fn(*a, **kw)
+            return awrap
+
+        @functools.wraps(fn)
+        def wrap(*a, **kw):
+            t = _tracer
+            if t is None:
+                return fn(*a, **kw)
+            with _span(t, label, cat, _args(fn, a)):
+                return fn(*a, **kw)
+        return wrap
+    return deco
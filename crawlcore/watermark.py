@@ -0,0 +1,81 @@
+import os
+import json
+from pathlib import Path
+from typing import Optional
+
+STATE_DIR = Path("./.crawl_state")
+
+def id_key(v) -> Optional[int]:
+    s = str(v if v is not None else "").strip()
+    return int(s) if s.isdigit() else None
+
+class Watermarks:
+    def __init__(self, source: str, enabled: bool = True, state_dir: Path = STATE_DIR):
+        self.source = source
+        self.enabled = enabled
+        self.path = state_dir / f"watermark_{source}.json"
+        self.marks = {}
+        if self.path.exists():
+            self.marks = json.loads(self.path.read_text(encoding="utf-8"))
+        self.saved = dict(self.marks)
+        self.holds = set()
+
+    def mark(self, key: str) -> Optional[int]:
+        if not self.enabled:
+            return None
+        m = self.marks.get(key)
+        return m["id"] if m else None
+
+    def is_new(self, key: str, item_id) -> bool:
+        mark = self.mark(key)
+        i = id_key(item_id)
+        return mark is None or i is None or i > mark
+
+    def begin(self, enabled: bool):
+        self.enabled = enabled
+        self.holds.clear()
+
+    def held_keys(self) -> list:
+        return sorted(k or "전체" for k in self.holds)
+
+    def held(self, key: Optional[str]) -> bool:
+        return key in self.holds or None in self.holds
+
+    def hold(self, key: Optional[str] = None):
+        if self.held(key):
+            return
+        self.holds.add(key)
+        for k in ([key] if key is not None else list(self.marks)):
+            if k in self.saved:
+                self.marks[k] = self.saved[k]
+            else:
+                self.marks.pop(k, None)
+        print(f"[watermark] {self.source} {key or '전체'}: 건너뛴 목록이 있어 기준점을 올리지 않음")
+
+    def advance(self, key: str, records: list, id_field: str, date_field: str = ""):
+        if self.held(key):
+            return
+        best = None
+        for r in records:
+            i = id_key(r.get(id_field))
+            if i is not None and (best is None or i > best[0]):
+                best = (i, r.get(date_field, "") if date_field else "")
+        if best is None:
+            return
+        cur = self.marks.get(key)
+        if cur and cur["id"] >= best[0]:
+            return
+        self.marks[key] = {"id": best[0], "created_at": best[1]}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.marks, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.saved = dict(self.marks)
+
+    def describe(self, key: str) -> str:
+        m = self.marks.get(key)
+        if not self.enabled or not m:
+            return f"{key}: 전체"
+        return f"{key}: id>{m['id']} ({m.get('created_at', '')})"
@@ -0,0 +1,123 @@
+import json
+import time
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+QUEUE_PATH = Path("./.crawl_state/queue.sqlite")
+LEASE_SEC = 300.0
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    shard TEXT UNIQUE NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks(state, id);
+"""
+
+class Task:
+    def __init__(self, id: int, shard: str, payload: dict, attempts: int):
+        self.id = id
+        self.shard = shard
+        self.payload = payload
+        self.attempts = attempts
+
+class WorkQueue:
+    def __init__(self, path: Optional[Path] = None, lease_sec: Optional[float] = None,
+                 max_attempts: Optional[int] = None):
+        self.path = Path(path or QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_sec = lease_sec or LEASE_SEC
+        self.max_attempts = max_attempts or MAX_ATTEMPTS
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def add(self, shard: str, payload: dict) -> bool:
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO tasks (shard, payload, updated) VALUES (?,?,?)",
+            (shard, json.dumps(payload, ensure_ascii=False, default=str), time.time()),
+        )
+        return cur.rowcount > 0
+
+    def lease(self, worker: str) -> Optional[Task]:
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute(
+                "SELECT id, shard, payload, attempts FROM tasks "
+                "WHERE state='queued' OR (state='leased' AND lease_until < ?) ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self.db.execute("COMMIT")
+                return None
+            self.db.execute(
+                "UPDATE tasks SET state='leased', worker=?, lease_until=?, attempts=attempts+1, updated=? WHERE id=?",
+                (worker, now + self.lease_sec, now, row[0]),
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return Task(row[0], row[1], json.loads(row[2]), row[3] + 1)
+
+    def renew(self, task: Task, worker: str) -> bool:
+        cur = self.db.execute(
+            "UPDATE tasks SET lease_until=?, updated=? WHERE id=? AND worker=? AND state='leased'",
+            (time.time() + self.lease_sec, time.time(), task.id, worker),
+        )
+        return cur.rowcount > 0
+
+    def done(self, task: Task, worker: str, result: dict) -> bool:
+        cur = self.db.execute(
+            "UPDATE tasks SET state='done', result=?, error=NULL, lease_until=NULL, updated=? "
+            "WHERE id=? AND worker=? AND state='leased'",
+            (json.dumps(result, ensure_ascii=False, default=str), time.time(), task.id, worker),
+        )
+        return cur.rowcount > 0
+
+    def fail(self, task: Task, worker: str, error: str) -> str:
+        state = "queued" if task.attempts < self.max_attempts else "failed"
+        self.db.execute(
+            "UPDATE tasks SET state=?, error=?, lease_until=NULL, updated=? WHERE id=? AND worker=? AND state='leased'",
+            (state, error, time.time(), task.id, worker),
+        )
+        return state
+
+    def requeue(self, states: tuple = ("failed",)) -> int:
+        cur = self.db.execute(
+            f"UPDATE tasks SET state='queued', attempts=0, lease_until=NULL, updated=? "
+            f"WHERE state IN ({','.join('?' * len(states))})",
+            (time.time(), *states),
+        )
+        return cur.rowcount
+
+    def open(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM tasks WHERE state IN ('queued', 'leased')").fetchone()[0]
+
+    def counts(self) -> dict:
+        return dict(self.db.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state"))
+
+    def tasks(self, state: Optional[str] = None) -> list:
+        sql = "SELECT id, shard, payload, state, attempts, worker, result, error FROM tasks"
+        rows = self.db.execute(sql + " WHERE state=? ORDER BY id" if state else sql + " ORDER BY id",
+                               (state,) if state else ())
+        return [
+            {"id": i, "shard": s, "payload": json.loads(p), "state": st, "attempts": a, "worker": w,
+             "result": json.loads(r) if r else None, "error": e}
+            for i, s, p, st, a, w, r, e in rows
+        ]
+
+    def close(self):
+        self.db.close()
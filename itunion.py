@@ -1,14 +1,27 @@
 import re
-import json
-import time
-import random
-import threading
-import requests
-import pandas as pd
+import sys
+import asyncio
 from pathlib import Path
-from datetime import datetime
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+from datetime import date, datetime
+
+from crawlcore.engine import Engine
+from crawlcore.httpcache import HttpCache
+from crawlcore.metrics import Metrics
+from crawlcore.watermark import Watermarks
+from crawlcore.pagelocate import PageLocator
+from crawlcore.paginate import paginate
+from crawlcore.pipeline import Pipeline
+from crawlcore import neardup
+from crawlcore import trace
+from crawlcore import parsepool
+from crawlcore.parsepool import ParsePool
+from crawlcore.sink import RecordSink
+from crawlcore.dataset import ParquetSink
+from crawlcore.journal import Journal, window_key
+from crawlcore.store import StoreSink
+from crawlcore import htmlparse as hp
+from crawlcore.htmlparse import cls, first, text
 
 try:
     from tqdm import tqdm
@@ -27,19 +40,30 @@ START_DATE = None
 END_DATE = None
 
 ZERO_STREAK_STOP = 5
+INCREMENTAL = False
+NEAR_DUP = False
+NEAR_DUP_SKIP = False
+HTTP_CACHE = True
 MAX_PAGES = None
 FETCH_DETAIL = True
+KEEP_HTML = False
 LIST_SLEEP = 0.05
+PAGE_WINDOW = 4
 DETAIL_WORKERS = 8
+PARSE_PROCS = 0
+MAX_QPS = 10.0
 RETRIES = 3
 TIMEOUT = 15
+ADAPTIVE = False
+SHARED_RATE = True
 
 OUTPUT_DIR = Path(".")
+OUTPUT_FORMAT = "csv"
 CHECKPOINT_DIR = Path("./.crawl_checkpoint")
 TODAY = datetime.now().strftime("%Y%m%d_%H%M")
-CHECKPOINT_DIR.mkdir(exist_ok=True)
 
-BASE_URL = "https://www.itunion.or.kr/xe/index.php"
+HOST = "www.itunion.or.kr"
+BASE_URL = f"https://{HOST}/xe/index.php"
 MID = "JOBQNA01"
 
 HEADERS = {
@@ -96,38 +120,19 @@ def get_srl(url):
     return m.group(1) if m else ""
 
 def srl_url(srl):
-    return f"https://www.itunion.or.kr/xe/index.php?mid={MID}&document_srl={srl}"
+    return f"{BASE_URL}?mid={MID}&document_srl={srl}"
 
 def to_int(v):
     return re.sub(r"[^\d]", "", str(v or ""))
 
-def cp_load(name):
-    p = CHECKPOINT_DIR / f"{name}.json"
-    if p.exists():
-        d = json.loads(p.read_text(encoding="utf-8"))
-        print(f"[체크포인트] {name}: page={d.get('last_page',0)} / {d.get('count',0)}건")
-        return d
-    return {"last_page": 0, "records": []}
-
-def cp_save(name, last_page, records):
-    (CHECKPOINT_DIR / f"{name}.json").write_text(
-        json.dumps({"last_page": last_page, "count": len(records), "records": records}, ensure_ascii=False),
-        encoding="utf-8"
-    )
-
-def cp_clear(name):
-    p = CHECKPOINT_DIR / f"{name}.json"
-    if p.exists():
-        p.unlink()
-
-def get_total_pages(session):
+@trace.traced("locate")
+async def get_total_pages():
     try:
-        resp = session.get(f"{BASE_URL}?mid={MID}&page=1", timeout=TIMEOUT)
-        soup = BeautifulSoup(resp.text, "html.parser")
+        html = await get_html(f"{BASE_URL}?mid={MID}&page=1")
         nums = [
             int(m.group(1))
-            for a in soup.select("a[href*='page=']")
-            for m in [re.search(r"page=(\d+)", a.get("href", ""))]
+            for href in page_links(html)
+            for m in [re.search(r"page=(\d+)", href)]
             if m
         ]
         if nums:
@@ -138,10 +143,74 @@ def get_total_pages(session):
         print(f"페이지수 파악 실패: {e}")
     return 1100
 
+def page_links(html):
+    if hp.fast():
+        root = hp.tree(html)
+        return root.xpath("//a[contains(@href, 'page=')]/@href") if root is not None else []
+    return [a.get("href", "") for a in hp.soup(html).select("a[href*='page=']")]
+
+def list_record(title, href, viewer, comments, category, date_text, date_title, views):
+    srl = get_srl(href) or get_srl(viewer)
+    url = srl_url(srl) if srl else (urljoin(BASE_URL, href) if href.startswith("/") else href)
+    if re.match(r"^\d{2}:\d{2}$", date_title):
+        date_str = f"{date_text} {date_title}"
+    else:
+        date_str = date_text
+    return {
+        "title": title, "url": url, "document_srl": srl,
+        "category": category, "date": date_str, "views": views,
+        "assent": "", "dissent": "", "comments": comments,
+        "tags": "", "content_text": "",
+        "crawled_at": datetime.now().isoformat(),
+    }
+
+def parse_list_row_lx(row):
+    try:
+        row_cls = " ".join((row.get("class") or "").split())
+        if any(c in row_cls for c in ["notice", "head", "bd_hd"]):
+            return None
+
+        title_cell = first(row, f".//td[{cls('title')}]")
+        if title_cell is None:
+            return None
+
+        title_a = first(title_cell, f"(.//a[{cls('hx')} or not({cls('replyNum')})])[1]")
+        if title_a is None:
+            return None
+
+        title = text(title_a, strip=True)
+        if not title or len(title) < 2:
+            return None
+
+        reply_a = first(title_cell, f".//a[{cls('replyNum')}]")
+        cate_cell = first(row, f".//td[{cls('cate')}]")
+        time_cell = first(row, f".//td[{cls('time')}]")
+        mno_cell = first(row, f".//td[{cls('m_no')}]")
+
+        return list_record(
+            title, title_a.get("href", ""), title_a.get("data-viewer", ""),
+            to_int(text(reply_a)) if reply_a is not None else "",
+            text(cate_cell, strip=True) if cate_cell is not None else "",
+            text(time_cell, strip=True) if time_cell is not None else "",
+            (time_cell.get("title", "") or "").strip() if time_cell is not None else "",
+            to_int(text(mno_cell)) if mno_cell is not None else "",
+        )
+    except Exception:
+        return None
+
+@trace.traced("parse")
+def parse_list(html):
+    if hp.fast():
+        root = hp.tree(hp.cut(html, "<table", "</table>"))
+        rows = root.xpath("//table//tbody//tr") if root is not None else []
+        return len(rows), [r for r in map(parse_list_row_lx, rows) if r]
+    rows = hp.soup(html).select("table tbody tr")
+    return len(rows), [r for r in map(parse_list_row, rows) if r]
+
 def parse_list_row(row):
     try:
-        cls = " ".join(row.get("class", []))
-        if any(c in cls for c in ["notice", "head", "bd_hd"]):
+        row_cls = " ".join(row.get("class", []))
+        if any(c in row_cls for c in ["notice", "head", "bd_hd"]):
             return None
 
         title_cell = row.select_one("td.title")
@@ -156,52 +225,99 @@ def parse_list_row(row):
         if not title or len(title) < 2:
             return None
 
-        href = title_a.get("href", "")
-        srl = get_srl(href) or get_srl(title_a.get("data-viewer", ""))
-        url = srl_url(srl) if srl else (f"https://www.itunion.or.kr{href}" if href.startswith("/") else href)
-
         reply_a = title_cell.select_one("a.replyNum")
-        comments = to_int(reply_a.get_text()) if reply_a else ""
-
         cate_cell = row.select_one("td.cate")
-        category = cate_cell.get_text(strip=True) if cate_cell else ""
-
         time_cell = row.select_one("td.time")
-        if time_cell:
-            date_text = time_cell.get_text(strip=True)
-            date_title = (time_cell.get("title", "") or "").strip()
-            if re.match(r"^\d{2}:\d{2}$", date_title):
-                date_str = f"{date_text} {date_title}"
-            else:
-                date_str = date_text
-        else:
-            date_str = ""
-
         mno_cell = row.select_one("td.m_no")
-        views = to_int(mno_cell.get_text()) if mno_cell else ""
-
-        return {
-            "title": title, "url": url, "document_srl": srl,
-            "category": category, "date": date_str, "views": views,
-            "assent": "", "dissent": "", "comments": comments,
-            "tags": "", "content_text": "", "content_html": "",
-            "crawled_at": datetime.now().isoformat(),
-        }
+
+        return list_record(
+            title, title_a.get("href", ""), title_a.get("data-viewer", ""),
+            to_int(reply_a.get_text()) if reply_a else "",
+            cate_cell.get_text(strip=True) if cate_cell else "",
+            time_cell.get_text(strip=True) if time_cell else "",
+            (time_cell.get("title", "") or "").strip() if time_cell else "",
+            to_int(mno_cell.get_text()) if mno_cell else "",
+        )
     except Exception:
         return None
 
-def parse_detail(html):
-    soup = BeautifulSoup(html, "html.parser")
-    out = {
+def empty_detail():
+    return {
         "category": "", "date": "", "views": "", "assent": "", "dissent": "",
-        "comments": "", "tags": "", "content_text": "", "content_html": ""
+        "comments": "", "tags": "", "content_text": ""
     }
 
+def side_count(out, label, val):
+    if "조회" in label:
+        out["views"] = val
+    elif "비추천" in label:
+        out["dissent"] = val
+    elif "추천" in label:
+        out["assent"] = val
+    elif "댓글" in label:
+        out["comments"] = val
+
+def parse_detail_lx(html):
+    out = empty_detail()
+    root = hp.tree(hp.cut(html, "<body", "</body>"))
+    if root is None:
+        return out
+
+    content_el = first(root, f"(//*[{cls('xe_content')}])[1]")
+    if content_el is not None:
+        junk = content_el.xpath(f".//script | .//style | .//*[{cls('ads')}]")
+        out["content_text"] = text(content_el, "\n", strip=True, skip=junk)
+        if KEEP_HTML:
+            for t in junk:
+                t.drop_tree()
+            out["content_html"] = hp.outer_html(content_el)
+
+    cate_el = first(root, f"(//strong[{cls('cate')}])[1]")
+    if cate_el is not None:
+        out["category"] = text(cate_el, strip=True)
+
+    date_el = first(root, f"(//span[{cls('date', 'm_no')}])[1]")
+    if date_el is not None:
+        out["date"] = text(date_el, strip=True)
+
+    side_fr = first(root, f"(//*[{cls('btm_area')}]//*[{cls('side', 'fr')}])[1]")
+    if side_fr is not None:
+        for span in side_fr.xpath(".//span"):
+            b = first(span, ".//b")
+            side_count(out, text(span, "\n").split("\n")[0].strip(), to_int(text(b)) if b is not None else "")
+
+    if not out["assent"] and not out["dissent"]:
+        vote_div = first(root, f"(//*[{cls('rd_vote')}])[1]")
+        if vote_div is not None:
+            btns = vote_div.xpath(".//a//b")
+            if len(btns) >= 1:
+                out["assent"] = to_int(text(btns[0]))
+            if len(btns) >= 2:
+                out["dissent"] = to_int(text(btns[1]))
+
+    tags = [
+        t.lstrip("#")
+        for t in (text(a, strip=True) for a in root.xpath(f"//*[{cls('tag_list')}]//a | //*[{cls('tags')}]//a | //a[{cls('tag')}]"))
+        if t
+    ]
+    if tags:
+        out["tags"] = ", ".join(tags)
+
+    return out
+
+@trace.traced("parse")
+def parse_detail(html):
+    if hp.fast():
+        return parse_detail_lx(html)
+    soup = hp.soup(html)
+    out = empty_detail()
+
     content_el = soup.select_one(".xe_content, div.xe_content")
     if content_el:
         for t in content_el.select("script, style, .ads"):
             t.decompose()
-        out["content_html"] = str(content_el)
+        if KEEP_HTML:
+            out["content_html"] = str(content_el)
         out["content_text"] = content_el.get_text("\n", strip=True)
 
     cate_el = soup.select_one("strong.cate.fl, strong.cate")
@@ -217,15 +333,7 @@ def parse_detail(html):
         for span in side_fr.select("span"):
             label = span.get_text(separator="\n").split("\n")[0].strip()
             b = span.select_one("b")
-            val = to_int(b.get_text()) if b else ""
-            if "조회" in label:
-                out["views"] = val
-            elif "비추천" in label:
-                out["dissent"] = val
-            elif "추천" in label:
-                out["assent"] = val
-            elif "댓글" in label:
-                out["comments"] = val
+            side_count(out, label, to_int(b.get_text()) if b else "")
 
     if not out["assent"] and not out["dissent"]:
         vote_div = soup.select_one(".rd_vote")
@@ -246,149 +354,188 @@ def parse_detail(html):
 
     return out
 
-_tls2 = threading.local()
-
-def get_session():
-    sess = getattr(_tls2, "sess", None)
-    if sess is None:
-        sess = requests.Session()
-        sess.headers.update(HEADERS)
-        a = requests.adapters.HTTPAdapter(
-            pool_connections=DETAIL_WORKERS * 2,
-            pool_maxsize=DETAIL_WORKERS * 2,
-            max_retries=0
-        )
-        sess.mount("https://", a)
-        sess.mount("http://", a)
-        _tls2.sess = sess
-    return sess
-
-def get_html(url):
-    last_err = None
-    for _ in range(RETRIES):
-        try:
-            r = get_session().get(url, timeout=TIMEOUT)
-            r.raise_for_status()
-            return r.text
-        except Exception as e:
-            last_err = e
-            time.sleep(0.25 + random.random() * 0.5)
-    raise last_err
+_marks = Watermarks("itunion", enabled=INCREMENTAL)
+_journal = None
+_near = None
+_engine = None
+_pool = ParsePool(0)
+
+def make_engine():
+    global _engine, _pool
+    _pool = ParsePool(parsepool.procs(PARSE_PROCS), parsepool.settings(__name__, hp.__name__))
+    eng = Engine(HEADERS, retries=RETRIES, timeout=TIMEOUT, cache=HttpCache() if HTTP_CACHE else None,
+                 metrics=Metrics("itunion"), adaptive=ADAPTIVE,
+                 shared_rate=SHARED_RATE, pool=_pool)
+    eng.host(HOST, qps=MAX_QPS, concurrency=DETAIL_WORKERS)
+    _engine = eng
+    return eng
+
+async def get_html(url, cache=False):
+    return await _engine.get(url, kind="text", cache=cache)
 
 def match_target(date_str: str) -> bool:
     if USE_DATE_RANGE:
         return in_range(date_str, START_DATE, END_DATE)
     return parse_year(date_str) == ONLY_YEAR
 
-def crawl_list(session):
-    cp = cp_load("itunion_list")
-    records = cp["records"]
-    start = cp.get("last_page", 0) + 1
+def row_date(s):
+    d = parse_date_ymd(s)
+    if d is None and re.search(r"^\d{2}:\d{2}|전|방금|오늘", str(s or "")):
+        return datetime.now().date()
+    return d
+
+@trace.traced("list")
+async def list_page(page):
+    return await _pool.run(parse_list, await get_html(f"{BASE_URL}?mid={MID}&page={page}"))
 
-    total = MAX_PAGES or get_total_pages(session)
+@trace.traced("locate")
+async def locate_pages(total):
+    if USE_DATE_RANGE:
+        start_date, end_date = START_DATE, END_DATE
+    else:
+        start_date, end_date = date(ONLY_YEAR, 1, 1), date(ONLY_YEAR, 12, 31)
+
+    loc = PageLocator(list_page, lambda pg: [row_date(r.get("date", "")) for r in pg[1]])
+    try:
+        lo, hi = await loc.locate(total, start_date, end_date, open_ended=MAX_PAGES is None)
+    except Exception as e:
+        print(f"페이지 범위 탐색 실패: {e}")
+        return loc, 1, total
+    print(f"[IT노조] 페이지 범위: {lo}~{hi} (탐색 {loc.probes}회)")
+    return loc, lo, hi
+
+async def crawl_list(put):
+    found = 0
+
+    total = MAX_PAGES or await get_total_pages()
+    loc, start, total = await locate_pages(total)
     target_desc = f"{START_DATE}~{END_DATE}" if USE_DATE_RANGE else f"{ONLY_YEAR}년"
     print(f"[IT노조] 총 페이지(추정): {total} | 시작: {start} | 대상: {target_desc}")
 
+    async def fetch(page):
+        got = _journal.page(MID, page)
+        if got is not None:
+            return got["n"], got["rows"]
+        try:
+            n_rows, rows = loc.take(page) or await list_page(page)
+        except Exception as e:
+            print(f"오류 page={page}: {e}")
+            _marks.hold(MID)
+            await asyncio.sleep(1.5)
+            return None
+        _journal.page_done(MID, page, n=n_rows, rows=rows)
+        if LIST_SLEEP:
+            await asyncio.sleep(LIST_SLEEP)
+        return n_rows, rows
+
     empty_streak = 0
     zero_streak = 0
 
     with tqdm(total=total, initial=start - 1, desc=f"목록({target_desc})", unit="page") as pbar:
-        for page in range(start, total + 1):
-            try:
-                resp = session.get(f"{BASE_URL}?mid={MID}&page={page}", timeout=TIMEOUT)
-                resp.raise_for_status()
-                rows = BeautifulSoup(resp.text, "html.parser").select("table tbody tr")
-
-                if not rows:
-                    empty_streak += 1
-                    if empty_streak >= 3:
-                        print(f"빈 페이지 3회 종료 page={page}")
-                        break
-                else:
-                    empty_streak = 0
-
-                hits = 0
-                for row in rows:
-                    r = parse_list_row(row)
-                    if r and match_target(r.get("date", "")):
-                        records.append(r)
-                        hits += 1
-
-                zero_streak = 0 if hits else (zero_streak + 1)
-
-                pbar.update(1)
-                pbar.set_postfix(total=len(records), hits=hits, zero=zero_streak)
-
-                if page % 10 == 0:
-                    cp_save("itunion_list", page, records)
-
-                if zero_streak >= ZERO_STREAK_STOP:
-                    print(f"조기종료 page={page} zero_streak={zero_streak}")
-                    break
-
-                if LIST_SLEEP:
-                    time.sleep(LIST_SLEEP)
-
-            except Exception as e:
-                print(f"오류 page={page}: {e}")
-                time.sleep(1.5)
-
-    cp_clear("itunion_list")
-    print(f"[IT노조] 목록 완료: {len(records)}건")
-    return records
-
-def _detail_job(rec):
+        async def consume(page, got):
+            nonlocal found, empty_streak, zero_streak
+            if got is None:
+                return False
+            n_rows, rows = got
+
+            if not n_rows:
+                empty_streak += 1
+                if empty_streak >= 3:
+                    print(f"빈 페이지 3회 종료 page={page}")
+                    return True
+            else:
+                empty_streak = 0
+
+            hits = []
+            reached = False
+            for r in rows:
+                if not _marks.is_new(MID, r.get("document_srl")):
+                    reached = True
+                    continue
+                if match_target(r.get("date", "")):
+                    hits.append(r)
+
+            found += len(hits)
+            await put(hits)
+            zero_streak = 0 if hits else (zero_streak + 1)
+
+            pbar.update(1)
+            pbar.set_postfix(total=found, hits=len(hits), zero=zero_streak)
+
+            if zero_streak >= ZERO_STREAK_STOP:
+                print(f"조기종료 page={page} zero_streak={zero_streak}")
+                return True
+
+            if reached:
+                print(f"증분 종료 page={page} ({_marks.describe(MID)})")
+                return True
+            return False
+
+        await paginate(range(start, total + 1), fetch, consume, window=PAGE_WINDOW)
+
+    print(f"[IT노조] 목록 완료: {found}건")
+    return found
+
+@trace.traced("detail")
+async def _detail_job(rec):
     srl = rec.get("document_srl", "")
     url = rec.get("url", "")
     if not srl or not url:
-        return srl, {}
-    return srl, parse_detail(get_html(url))
-
-def crawl_detail(records):
-    if not FETCH_DETAIL or not records:
-        return records
-
-    uniq = {}
-    for r in records:
-        s = r.get("document_srl", "")
-        if s and s not in uniq:
-            uniq[s] = r
-    records = list(uniq.values())
+        return rec, {}
+    try:
+        return rec, await _pool.run(parse_detail, await get_html(url, cache=HTTP_CACHE))
+    except Exception as e:
+        print(f"상세 오류: {e}")
+        return rec, {}
 
-    srl_map = {r.get("document_srl", ""): r for r in records}
-    pending = [r for r in records if r.get("document_srl")]
+def emit(sink, rec):
+    if sink.write(rec):
+        _marks.advance(MID, [rec], "document_srl", "date")
 
+async def crawl(sink):
     target_desc = f"{START_DATE}~{END_DATE}" if USE_DATE_RANGE else f"{ONLY_YEAR}"
-    print(f"[IT노조] 상세 병렬: {len(pending)}건 workers={DETAIL_WORKERS}")
-
-    saved_count = 0
-    with tqdm(total=len(pending), desc=f"상세({target_desc})", unit="건") as pbar:
-        with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as ex:
-            futs = {ex.submit(_detail_job, r): r for r in pending}
-            for fut in as_completed(futs):
-                try:
-                    got_srl, meta = fut.result()
-                    if got_srl and meta:
-                        rr = srl_map.get(got_srl)
-                        if rr:
-                            for k in ("content_text", "content_html", "tags"):
-                                if meta.get(k):
-                                    rr[k] = meta[k]
-                            for k in ("category", "date", "views", "assent", "dissent", "comments"):
-                                if (not rr.get(k)) and meta.get(k):
-                                    rr[k] = meta[k]
-                except Exception as e:
-                    print(f"상세 오류: {e}")
-
-                pbar.update(1)
-                saved_count += 1
-                if saved_count >= 200:
-                    cp_save("itunion_detail", 0, records)
-                    saved_count = 0
-
-    cp_clear("itunion_detail")
+    workers = DETAIL_WORKERS if FETCH_DETAIL else 1
+    print(f"[IT노조] 목록+상세 병렬: workers={workers}")
+
+    async def work(rec):
+        if not FETCH_DETAIL:
+            return rec, None
+        done = _journal.detail(rec.get("document_srl", ""))
+        if isinstance(done, dict):
+            return done, None
+        if isinstance(sink, StoreSink) and sink.known(rec["url"]):
+            return rec, None
+        if _near is not None and NEAR_DUP_SKIP and _near.skip_fetch(rec, f"itunion:{rec.get('document_srl', '')}"):
+            return rec, None
+        return await _detail_job(rec)
+
+    with tqdm(total=0, desc=f"상세({target_desc})", unit="건") as pbar:
+        def done(got):
+            rr, meta = got
+            if meta is not None:
+                for k in ("content_text", "content_html", "tags"):
+                    if meta.get(k):
+                        rr[k] = meta[k]
+                for k in ("category", "date", "views", "assent", "dissent", "comments"):
+                    if (not rr.get(k)) and meta.get(k):
+                        rr[k] = meta[k]
+            if _near is not None and "cluster_id" not in rr:
+                _near.tag(rr, f"itunion:{rr.get('document_srl', '')}", "content_text", drop=("content_html",),
+                          skip=NEAR_DUP_SKIP)
+            emit(sink, rr)
+            if meta is not None and rr.get("document_srl"):
+                _journal.detail_done(rr["document_srl"], rr)
+            pbar.update(1)
+
+        async with Pipeline(work, done, workers, key=lambda r: r.get("document_srl") or r.get("url")) as pipe:
+            async def put(recs):
+                await pipe.put_many(recs)
+                pbar.total = pipe.queued
+
+            await crawl_list(put)
+
     print("[IT노조] 상세 완료")
-    return records
+    return pipe.done
 
 COLS = [
     "title", "url", "category", "date",
@@ -396,22 +543,55 @@ COLS = [
     "tags", "content_text", "crawled_at",
 ]
 
-def save(records):
-    if not records:
-        print("데이터 없음")
-        return
-
-    df = pd.DataFrame(records).drop_duplicates(subset=["url"]).reset_index(drop=True)
-    df = df[[c for c in COLS if c in df.columns]]
+PARQUET_TYPES = {
+    "document_srl": "int", "category": "category", "date": "datetime",
+    "views": "int", "assent": "int", "dissent": "int", "comments": "int",
+    "crawled_at": "datetime",
+}
 
+def open_sink():
+    cols = COLS + (["content_html"] if KEEP_HTML else []) + (["cluster_id"] if NEAR_DUP else [])
+    if OUTPUT_FORMAT == "parquet":
+        return ParquetSink("itunion", cols + ["document_srl"], PARQUET_TYPES, key="url", date_field="date")
+    if OUTPUT_FORMAT == "sqlite":
+        return StoreSink("itunion", cols + ["document_srl"], key="url", title="title", body="content_text",
+                         date_field="date", url="url")
     if USE_DATE_RANGE:
-        name = f"itunion_{START_DATE}_to_{END_DATE}_{TODAY}.csv".replace(":", "-")
+        name = f"itunion_{START_DATE}_to_{END_DATE}_{TODAY}.{OUTPUT_FORMAT}".replace(":", "-")
     else:
-        name = f"itunion_{ONLY_YEAR}_{TODAY}.csv"
+        name = f"itunion_{ONLY_YEAR}_{TODAY}.{OUTPUT_FORMAT}"
+    return RecordSink(OUTPUT_DIR / name, cols, key="url")
 
-    path = OUTPUT_DIR / name
-    df.to_csv(path, index=False, encoding="utf-8-sig")
-    print(f"저장: {path} ({len(df)}건)")
+def save(sink):
+    if not sink.count:
+        print("데이터 없음")
+        return
+    print(f"저장: {sink.path} ({sink.count}건)")
+
+@trace.traced("window")
+async def crawl_window() -> int:
+    global _journal, _near
+    _marks.begin(INCREMENTAL)
+    failed0 = _engine.metrics.failures()
+    _near = neardup.shared() if NEAR_DUP else None
+    _journal = Journal("itunion", {
+        "mid": MID, "start": START_DATE, "end": END_DATE,
+        "year": None if USE_DATE_RANGE else ONLY_YEAR, "detail": FETCH_DETAIL,
+    }, root=CHECKPOINT_DIR, window=window_key(START_DATE, END_DATE) if USE_DATE_RANGE else str(ONLY_YEAR))
+
+    with open_sink() as sink:
+        await crawl(sink)
+    save(sink)
+    if _near is not None:
+        _near.save()
+        print(_near.report())
+    _journal.finish(_engine.metrics.failures() - failed0)
+    return sink.count
+
+async def run():
+    async with make_engine() as eng:
+        await crawl_window()
+        print(eng.rate_report())
 
 def main():
     global START_DATE, END_DATE
@@ -428,12 +608,13 @@ def main():
     print(f"FETCH_DETAIL={FETCH_DETAIL} WORKERS={DETAIL_WORKERS} ZERO_STREAK={ZERO_STREAK_STOP}")
     print("=" * 60)
 
-    session = requests.Session()
-    session.headers.update(HEADERS)
-
-    records = crawl_list(session)
-    records = crawl_detail(records)
-    save(records)
+    if "--profile" in sys.argv:
+        trace.start("itunion")
+    try:
+        asyncio.run(run())
+    finally:
+        trace.stop()
+    _marks.save()
 
     print(f"완료 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
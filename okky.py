@@ -1,14 +1,28 @@
 import re
 import json
 import time
-import random
-import threading
-import requests
-import pandas as pd
+import sys
+import asyncio
 from pathlib import Path
 from datetime import datetime
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from crawlcore.engine import Engine, FetchError
+from crawlcore.httpcache import HttpCache
+from crawlcore.metrics import Metrics
+from crawlcore.watermark import Watermarks
+from crawlcore.pagelocate import PageLocator
+from crawlcore.paginate import paginate
+from crawlcore.pipeline import Pipeline
+from crawlcore import neardup
+from crawlcore import trace
+from crawlcore import parsepool
+from crawlcore.parsepool import ParsePool
+from crawlcore.sink import RecordSink
+from crawlcore.dataset import ParquetSink
+from crawlcore.journal import Journal, window_key
+from crawlcore.store import StoreSink
+from crawlcore import htmlparse as hp
+from crawlcore.htmlparse import html_text, next_data
 
 try:
     from tqdm import tqdm
@@ -22,8 +36,9 @@ except ImportError:
         def refresh(self): pass
         def close(self): pass
 
-OKKY_BASE = "https://okky.kr"
-API_BASE  = "https://okky.kr/api/okky-web"
+OKKY_HOST = "okky.kr"
+OKKY_BASE = f"https://{OKKY_HOST}"
+API_BASE  = f"{OKKY_BASE}/api/okky-web"
 
 CATEGORY_CODES = [
     "life","ai","salary","rookie",
@@ -33,13 +48,24 @@ CATEGORY_CODES = [
 ]
 
 LIST_WORKERS = 6
+PAGE_WINDOW = 3
 DETAIL_WORKERS = 10
+PARSE_PROCS = 0
 MAX_QPS = 8.0
 RETRIES = 4
 TIMEOUT = 20
 ZERO_STREAK_STOP = 4
+INCREMENTAL = False
+NEAR_DUP = False
+NEAR_DUP_SKIP = False
+HTTP_CACHE = True
+LEAN = False
+ADAPTIVE = False
+SHARED_RATE = True
 
 OUTPUT_DIR = Path(".")
+CHECKPOINT_DIR = Path("./.crawl_checkpoint")
+OUTPUT_FORMAT = "csv"
 TODAY = datetime.now().strftime("%Y%m%d_%H%M")
 
 HEADERS = {
@@ -54,76 +80,46 @@ CONTENT_KEYS = ("content","contentText","contentHtml","contentHTML","contentMark
 START_DATE = None
 END_DATE = None
 
-_qps_lock = threading.Lock()
-_tokens = MAX_QPS
-_last_ref = time.monotonic()
-
-def _acquire():
-    global _tokens,_last_ref
-    while True:
-        with _qps_lock:
-            now = time.monotonic()
-            _tokens = min(MAX_QPS,_tokens+(now-_last_ref)*MAX_QPS)
-            _last_ref = now
-            if _tokens >= 1.0:
-                _tokens -= 1.0
-                return
-        time.sleep(0.01)
-
-_tls = threading.local()
-
-def sess():
-    s = getattr(_tls,"s",None)
-    if s is None:
-        s = requests.Session()
-        s.headers.update(HEADERS)
-        s.mount("https://", requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0))
-        _tls.s = s
-    return s
-
-def get(url, want_json=True):
-    backoff = 0.5
-    last_err = None
-    for _ in range(RETRIES):
-        try:
-            _acquire()
-            r = sess().get(url, timeout=TIMEOUT)
-
-            if r.status_code == 429:
-                wait = float(r.headers.get("Retry-After", backoff * 2)) + random.random()
-                time.sleep(wait)
-                backoff = min(backoff * 2, 30)
-                continue
-
-            if r.status_code in (403,404):
-                return None
-
-            if 500 <= r.status_code < 600:
-                time.sleep(backoff)
-                backoff = min(backoff * 2, 30)
-                continue
-
-            r.raise_for_status()
-            return r.json() if want_json else r.text
-
-        except Exception as e:
-            last_err = e
-            time.sleep(backoff)
-            backoff = min(backoff * 2, 15)
-
-    return None
+_marks = Watermarks("okky", enabled=INCREMENTAL)
+_journal = None
+_near = None
+_engine = None
+_pool = ParsePool(0)
+
+def make_engine():
+    global _engine, _bid_lock, _pool
+    _bid_lock = asyncio.Lock()
+    _pool = ParsePool(parsepool.procs(PARSE_PROCS), parsepool.settings(__name__, hp.__name__))
+    eng = Engine(HEADERS, retries=RETRIES, timeout=TIMEOUT, cache=HttpCache() if HTTP_CACHE else None,
+                 metrics=Metrics("okky"), adaptive=ADAPTIVE,
+                 shared_rate=SHARED_RATE, pool=_pool)
+    eng.host(OKKY_HOST, qps=MAX_QPS, concurrency=max(LIST_WORKERS, DETAIL_WORKERS))
+    _engine = eng
+    return eng
+
+async def get(url, want_json=True, cache_key=None, raw=False):
+    try:
+        return await _engine.get(url, kind="bytes" if raw else "json" if want_json else "text", missing=(403,404),
+                                 cache=cache_key is not None, cache_key=cache_key)
+    except FetchError:
+        return None
 
 _build_id = None
-_bid_lock = threading.Lock()
+_bid_stale = None
+_bid_lock = asyncio.Lock()
 
-def get_build_id():
-    global _build_id
-    if _build_id:
+async def get_build_id(stale=None):
+    global _build_id, _bid_stale
+    if _build_id and _build_id != stale:
         return _build_id
-    with _bid_lock:
-        if _build_id:
+    async with _bid_lock:
+        if _build_id and _build_id != stale:
             return _build_id
-        html = get(f"{OKKY_BASE}/", want_json=False)
+        if stale is not None:
+            if stale == _bid_stale:
+                return _build_id
+            _bid_stale = stale
+        html = await get(f"{OKKY_BASE}/", want_json=False)
         if not html:
             return None
         m = re.search(r'"buildId"\s*:\s*"([^"]+)"', html)
@@ -170,7 +166,7 @@ def clean_html(ct: str) -> str:
     if not ct:
         return ""
     if "<" in ct and ">" in ct:
-        return BeautifulSoup(ct, "html.parser").get_text("\n", strip=True)
+        return html_text(ct)
     return ct.strip()
 
 def pick_content(obj: dict) -> str:
@@ -200,6 +196,7 @@ def pick_content(obj: dict) -> str:
 
     return ""
 
+@trace.traced("parse")
 def extract_detail(data: dict, aid: str) -> str:
     if not isinstance(data, dict):
         return ""
@@ -218,125 +215,184 @@ def extract_detail(data: dict, aid: str) -> str:
                     return ct
     return ""
 
-def fetch_detail(aid: str) -> str:
-    bid = get_build_id()
+def parse_detail(body, aid: str) -> str:
+    try:
+        return extract_detail(json.loads(body), aid)
+    except ValueError:
+        return ""
+
+def parse_detail_html(html: str, aid: str) -> str:
+    raw = next_data(html)
+    return parse_detail(raw, aid) if raw else ""
+
+@trace.traced("detail")
+async def fetch_detail(aid: str) -> str:
+    bid = await get_build_id()
     if bid:
-        data = get(f"{OKKY_BASE}/_next/data/{bid}/articles/{aid}.json")
-        if isinstance(data, dict):
-            ct = extract_detail(data, aid)
+        body = await get(f"{OKKY_BASE}/_next/data/{bid}/articles/{aid}.json",
+                         cache_key=f"okky:article:{aid}:json", raw=True)
+        if body is None:
+            fresh = await get_build_id(stale=bid)
+            if fresh and fresh != bid:
+                body = await get(f"{OKKY_BASE}/_next/data/{fresh}/articles/{aid}.json",
+                                 cache_key=f"okky:article:{aid}:json", raw=True)
+        if body:
+            ct = await _pool.run(parse_detail, body, aid)
             if ct:
                 return ct
+    if LEAN:
+        return ""
 
-    html = get(f"{OKKY_BASE}/articles/{aid}", want_json=False)
+    html = await get(f"{OKKY_BASE}/articles/{aid}", want_json=False, cache_key=f"okky:article:{aid}:html")
     if not html:
         return ""
-    soup = BeautifulSoup(html, "html.parser")
-    tag = soup.find("script", id="__NEXT_DATA__")
-    if tag and tag.string:
-        try:
-            nd = json.loads(tag.string)
-            return extract_detail(nd, aid)
-        except Exception:
-            return ""
-    return ""
+    return await _pool.run(parse_detail_html, html, aid)
 
-def fetch_category(code: str):
-    first = get(f"{API_BASE}/articles?page=0&categoryCode={code}")
-    if not isinstance(first, dict):
-        return []
-    total = int(first.get("totalPages", 0) or 0)
-    if total <= 0:
+def item_dates(data) -> list:
+    if not isinstance(data, dict):
         return []
+    return [parse_date_ymd(item.get("dateCreated") or "") for item in (data.get("content") or [])]
 
+@trace.traced("parse")
+def parse_page(code: str, data: dict) -> tuple[list, bool]:
     out = []
-    zero = 0
-
-    for p in range(total):
-        data = first if p == 0 else get(f"{API_BASE}/articles?page={p}&categoryCode={code}")
-        if not isinstance(data, dict):
+    reached = False
+    for item in (data.get("content") or []):
+        aid = str(item.get("id", "")).strip()
+        if not aid.isdigit():
+            continue
+        if not _marks.is_new(code, aid):
+            reached = True
+            continue
+        created = (item.get("dateCreated") or "").strip()
+        if not in_range(created):
             continue
 
-        hits = 0
-        for item in (data.get("content") or []):
-            aid = str(item.get("id", "")).strip()
-            if not aid.isdigit():
-                continue
-            created = (item.get("dateCreated") or "").strip()
-            if not in_range(created):
-                continue
-
-            hits += 1
-            out.append({
-                "title": (item.get("title") or "").strip(),
-                "url": f"{OKKY_BASE}/articles/{aid}",
-                "article_id": aid,
-                "category": (item.get("category") or {}).get("defaultLabel",""),
-                "author": (item.get("displayAuthor") or {}).get("nickname","") if isinstance(item.get("displayAuthor"), dict) else "",
-                "created_at": created,
-                "views": str(item.get("viewCount") or ""),
-                "assent": str(item.get("assentCount") or ""),
-                "dissent": str(item.get("dissentCount") or ""),
-                "comments": str(item.get("noteCount") or ""),
-                "tags": "",
-                "content_text": "",
-                "crawled_at": datetime.now().isoformat(),
-            })
-
-        zero = 0 if hits else zero + 1
-        if zero >= ZERO_STREAK_STOP:
+        out.append({
+            "title": (item.get("title") or "").strip(),
+            "url": f"{OKKY_BASE}/articles/{aid}",
+            "article_id": aid,
+            "category_code": code,
+            "category": (item.get("category") or {}).get("defaultLabel",""),
+            "author": (item.get("displayAuthor") or {}).get("nickname","") if isinstance(item.get("displayAuthor"), dict) else "",
+            "created_at": created,
+            "views": str(item.get("viewCount") or ""),
+            "assent": str(item.get("assentCount") or ""),
+            "dissent": str(item.get("dissentCount") or ""),
+            "comments": str(item.get("noteCount") or ""),
+            "tags": "",
+            "content_text": "",
+            "crawled_at": datetime.now().isoformat(),
+        })
+    return out, reached
+
+@trace.traced("list")
+async def fetch_category(code: str, put) -> int:
+    url = f"{API_BASE}/articles?categoryCode={code}&page="
+    first = await get(f"{url}0")
+    if not isinstance(first, dict):
+        return 0
+    total = int(first.get("totalPages", 0) or 0)
+    if total <= 0:
+        return 0
+
+    loc = PageLocator(lambda p: _engine.get(f"{url}{p}", missing=(403,404)), item_dates, first_page=0)
+    loc.seed(0, first)
+    for attempt in range(2):
+        try:
+            lo, hi = await loc.locate(total - 1, START_DATE, END_DATE)
             break
+        except FetchError as e:
+            if attempt:
+                raise
+            print(f"[{code}] 페이지 범위 탐색 실패, 재시도: {e}")
+
+    async def fetch(p):
+        got = _journal.page(code, p)
+        if got is not None:
+            return got["out"], got["reached"]
+        data = loc.take(p) or await get(f"{url}{p}")
+        if not isinstance(data, dict):
+            _marks.hold(code)
+            return None
+        page_out, reached = parse_page(code, data)
+        _journal.page_done(code, p, out=page_out, reached=reached)
+        return page_out, reached
+
+    n = 0
+    zero = 0
+
+    async def consume(p, got):
+        nonlocal n, zero
+        if got is None:
+            return False
+        page_out, reached = got
+        n += len(page_out)
+        await put(page_out)
+        zero = 0 if page_out else zero + 1
+        return zero >= ZERO_STREAK_STOP or reached
 
-    return out
+    await paginate(range(lo, hi + 1), fetch, consume, window=PAGE_WINDOW)
+    return n
 
-def run_pipeline():
-    all_records = []
-    id_map = {}
-    lock = threading.Lock()
+async def run_pipeline(sink):
+    filled = 0
 
     list_pbar = tqdm(total=len(CATEGORY_CODES), desc="목록", unit="cat", position=0)
     detail_pbar = tqdm(total=0, desc="상세", unit="건", position=1)
 
-    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as ex:
-        futs = {ex.submit(fetch_category, c): c for c in CATEGORY_CODES}
-        for fut in as_completed(futs):
-            code = futs[fut]
-            recs = fut.result() or []
+    list_sem = asyncio.Semaphore(LIST_WORKERS)
 
-            with lock:
-                for r in recs:
-                    aid = r.get("article_id")
-                    if aid and aid not in id_map:
-                        id_map[aid] = r
-                        all_records.append(r)
-
-            detail_pbar.total = (detail_pbar.total or 0) + len(recs)
+    async def detail_job(r):
+        done = _journal.detail(r["article_id"])
+        if isinstance(done, dict):
+            return done, bool(done["content_text"])
+        if isinstance(sink, StoreSink) and sink.known(r["article_id"]):
+            return r, False
+        if _near is not None and NEAR_DUP_SKIP and _near.skip_fetch(r, f"okky:{r['article_id']}"):
+            return r, False
+        try:
+            ct = await fetch_detail(r["article_id"])
+            if ct:
+                r["content_text"] = ct
+        except Exception:
+            pass
+        _journal.detail_done(r["article_id"], r)
+        return r, bool(r["content_text"])
+
+    def emit(got):
+        nonlocal filled
+        r, has_content = got
+        if _near is not None and "cluster_id" not in r:
+            _near.tag(r, f"okky:{r['article_id']}", "content_text", skip=NEAR_DUP_SKIP)
+        if sink.write(r):
+            filled += has_content
+            _marks.advance(r["category_code"], [r], "article_id", "created_at")
+        detail_pbar.update(1)
+
+    async with Pipeline(detail_job, emit, DETAIL_WORKERS, key=lambda r: r["article_id"]) as pipe:
+        async def put(recs):
+            await pipe.put_many(recs)
+            detail_pbar.total = pipe.queued
             detail_pbar.refresh()
 
+        async def list_job(code):
+            async with list_sem:
+                n = await fetch_category(code, put)
             list_pbar.update(1)
-            list_pbar.set_postfix(cat=code, n=len(recs))
-
-    list_pbar.close()
-
-    if not all_records:
-        detail_pbar.close()
-        return []
+            list_pbar.set_postfix(cat=code, n=n)
 
-    pending = list(all_records)
-
-    with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as ex:
-        futs = {ex.submit(fetch_detail, r["article_id"]): r for r in pending}
-        for fut in as_completed(futs):
-            r = futs[fut]
-            try:
-                ct = fut.result()
-                if ct:
-                    r["content_text"] = ct
-            except Exception:
-                pass
-            detail_pbar.update(1)
+        jobs = [asyncio.create_task(list_job(c)) for c in CATEGORY_CODES]
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            for t in jobs:
+                t.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+        list_pbar.close()
 
     detail_pbar.close()
-    return all_records
+    return filled
 
 COLS = [
     "title","url","category","author",
@@ -344,21 +400,51 @@ COLS = [
     "tags","content_text","crawled_at",
 ]
 
-def save(records):
-    if not records:
+PARQUET_TYPES = {
+    "article_id": "int", "category": "category", "author": "category",
+    "created_at": "datetime", "views": "int", "assent": "int",
+    "dissent": "int", "comments": "int", "crawled_at": "datetime",
+}
+
+def open_sink():
+    cols = COLS + ["cluster_id"] if NEAR_DUP else COLS
+    if OUTPUT_FORMAT == "parquet":
+        return ParquetSink("okky", cols, PARQUET_TYPES, key="article_id", date_field="created_at")
+    if OUTPUT_FORMAT == "sqlite":
+        return StoreSink("okky", cols, key="article_id", title="title", body="content_text",
+                         date_field="created_at", author="author", url="url")
+    name = f"okky_{START_DATE}_to_{END_DATE}_{TODAY}.{OUTPUT_FORMAT}".replace(":", "-")
+    return RecordSink(OUTPUT_DIR / name, cols, key="article_id")
+
+def save(sink, filled: int):
+    if not sink.count:
         print("데이터 없음")
         return
-
-    df = pd.DataFrame(records).drop_duplicates(subset=["article_id"]).reset_index(drop=True)
-    if "content_text" in df.columns:
-        df["content_text"] = df["content_text"].astype("object")
-
-    df = df[[c for c in COLS if c in df.columns]]
-    name = f"okky_{START_DATE}_to_{END_DATE}_{TODAY}.csv".replace(":", "-")
-    path = OUTPUT_DIR / name
-    df.to_csv(path, index=False, encoding="utf-8-sig")
-    filled = (df["content_text"].notna() & (df["content_text"].astype(str).str.len() > 0)).sum()
-    print("저장:", path, "건수:", len(df), "content:", f"{filled}/{len(df)}")
+    print("저장:", sink.path, "건수:", sink.count, "content:", f"{filled}/{sink.count}")
+
+@trace.traced("window")
+async def crawl_window() -> int:
+    global _journal, _near
+    _marks.begin(INCREMENTAL)
+    failed0 = _engine.metrics.failures()
+    _near = neardup.shared() if NEAR_DUP else None
+    _journal = Journal("okky", {"start": START_DATE, "end": END_DATE, "codes": CATEGORY_CODES}, root=CHECKPOINT_DIR,
+                       window=window_key(START_DATE, END_DATE))
+
+    await get_build_id()
+    with open_sink() as sink:
+        filled = await run_pipeline(sink)
+    save(sink, filled)
+    if _near is not None:
+        _near.save()
+        print(_near.report())
+    _journal.finish(_engine.metrics.failures() - failed0)
+    return sink.count
+
+async def run():
+    async with make_engine() as eng:
+        await crawl_window()
+        print(eng.rate_report())
 
 def main():
     global START_DATE, END_DATE
@@ -370,10 +456,17 @@ def main():
     print("DETAIL_WORKERS:", DETAIL_WORKERS, "MAX_QPS:", MAX_QPS)
     print("=" * 60)
 
+    if INCREMENTAL:
+        print("증분 수집:", ", ".join(_marks.describe(c) for c in CATEGORY_CODES))
+
     t0 = time.time()
-    get_build_id()
-    records = run_pipeline()
-    save(records)
+    if "--profile" in sys.argv:
+        trace.start("okky")
+    try:
+        asyncio.run(run())
+    finally:
+        trace.stop()
+    _marks.save()
     print("elapsed_min:", round((time.time() - t0) / 60, 2))
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+import os
+import csv
+import json
+import time
+import socket
+import asyncio
+import argparse
+import importlib
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+
+from batch import SOURCES, parse_day, parse_window, split_range, apply
+from crawlcore.workqueue import WorkQueue
+from crawlcore.engine import FetchError
+from crawlcore.sink import RecordSink
+from crawlcore.ratelimit import SHARED_OK
+from crawlcore import trace
+
+SHARD_DIR = Path("./shards")
+OUTPUT_DIR = Path(".")
+FORMATS = ("csv", "jsonl")
+POLL_SEC = 5.0
+TODAY = datetime.now().strftime("%Y%m%d_%H%M")
+
+DATASETS = {
+    "okky": [("okky", "article_id")],
+    "itunion": [("itunion", "url")],
+    "careerly": [("careerly_qna", "id"), ("careerly_posts", "id")],
+}
+
+def check(eng):
+    failed = eng.metrics.failures()
+    if failed:
+        raise FetchError(f"최종 실패 요청 {failed}건")
+
+def bad_formats(sources: list, overrides: dict) -> list:
+    apply(overrides)
+    out = []
+    for s in sources:
+        mod = importlib.import_module(s)
+        if mod.OUTPUT_FORMAT not in FORMATS:
+            out.append(f"{s}.OUTPUT_FORMAT={mod.OUTPUT_FORMAT}")
+    return out
+
+def plan(q: WorkQueue, sources: list, windows: list) -> int:
+    n = 0
+    for s in sources:
+        for start, end in windows:
+            base = {"source": s, "start": start, "end": end}
+            if s == "okky":
+                import okky
+                for code in okky.CATEGORY_CODES:
+                    n += q.add(f"okky:{start}~{end}:{code}", {**base, "codes": [code]})
+            else:
+                n += q.add(f"{s}:{start}~{end}", base)
+    return n
+
+async def run_okky(mod, start, end, p) -> int:
+    mod.START_DATE, mod.END_DATE = start, end
+    mod.CATEGORY_CODES = p["codes"]
+    async with mod.make_engine() as eng:
+        n = await mod.crawl_window()
+        print(eng.rate_report())
+        check(eng)
+    return n
+
+async def run_itunion(mod, start, end, p) -> int:
+    mod.USE_DATE_RANGE = True
+    mod.START_DATE, mod.END_DATE = start, end
+    async with mod.make_engine() as eng:
+        n = await mod.crawl_window()
+        print(eng.rate_report())
+        check(eng)
+    return n
+
+async def run_careerly(mod, start, end, p) -> int:
+    async with mod.make_engine(mod.load_cookies()) as eng:
+        await mod.ensure_session()
+        ds = datetime.combine(start, datetime.min.time())
+        de = datetime.combine(end, datetime.min.time())
+        n = await mod.crawl_window(ds, de)
+        mod.save_cookies(mod.dump_cookies())
+        print(eng.rate_report())
+        check(eng)
+    return n
+
+RUNNERS = {"okky": run_okky, "itunion": run_itunion, "careerly": run_careerly}
+
+async def run_task(task, out: Path) -> dict:
+    p = task.payload
+    mod = importlib.import_module(p["source"])
+    part = out / f"{task.id:05d}"
+    part.mkdir(parents=True, exist_ok=True)
+    for f in part.iterdir():
+        if f.is_file():
+            f.unlink()
+    mod.OUTPUT_DIR = part
+    mod.CHECKPOINT_DIR = out / "checkpoint" / f"{task.id:05d}"
+    n = await RUNNERS[p["source"]](mod, parse_day(p["start"]), parse_day(p["end"]), p)
+    files = sorted(f.name for f in part.iterdir() if f.suffix.lstrip(".") in FORMATS)
+    return {"count": n, "dir": str(part), "files": files}
+
+async def heartbeat(q: WorkQueue, task, wid: str):
+    while True:
+        await asyncio.sleep(q.lease_sec / 3)
+        if not q.renew(task, wid):
+            print(f"[shard] {wid} {task.shard} 임대 만료 (다른 워커가 가져갔을 수 있음)")
+
+async def work_loop(q: WorkQueue, out: Path, wid: str) -> int:
+    n = 0
+    while True:
+        task = q.lease(wid)
+        if task is None:
+            if not q.open():
+                return n
+            await asyncio.sleep(POLL_SEC)
+            continue
+        print(f"[shard] {wid} {task.shard} 시작 (시도 {task.attempts}/{q.max_attempts})")
+        hb = asyncio.create_task(heartbeat(q, task, wid))
+        t0 = time.time()
+        try:
+            result = await run_task(task, out)
+        except Exception as e:
+            state = q.fail(task, wid, repr(e))
+            print(f"[shard] {wid} {task.shard} 실패 -> {state}: {e!r}")
+        else:
+            result["sec"] = round(time.time() - t0, 1)
+            if q.done(task, wid, result):
+                n += 1
+                print(f"[shard] {wid} {task.shard} 완료 {result['count']}건 {result['sec']}s")
+            else:
+                print(f"[shard] {wid} {task.shard} 완료했지만 임대를 잃어 결과를 버림")
+        finally:
+            hb.cancel()
+
+def worker(queue: str, out: str, overrides: dict, profile: bool = False):
+    apply(overrides)
+    wid = f"{socket.gethostname()}:{os.getpid()}"
+    q = WorkQueue(Path(queue))
+    if profile:
+        trace.start("shard")
+    try:
+        n = asyncio.run(work_loop(q, Path(out), wid))
+    finally:
+        q.close()
+        trace.stop()
+    print(f"[shard] {wid} 종료 (완료 {n}개)")
+
+async def login_careerly():
+    import careerly
+    async with careerly.make_engine(careerly.load_cookies()):
+        await careerly.ensure_session()
+        careerly.save_cookies(careerly.dump_cookies())
+
+def split_qps(procs: int, overrides: dict) -> dict:
+    apply(overrides)
+    split = {}
+    for s in SOURCES:
+        mod = importlib.import_module(s)
+        if procs > 1 and not (SHARED_OK and mod.SHARED_RATE):
+            split[f"{s}.MAX_QPS"] = mod.MAX_QPS / procs
+    if split:
+        print(f"[shard] 경고: 프로세스 간 속도 공유를 쓸 수 없어 MAX_QPS 를 {procs}개로 나눔: "
+              + ", ".join(f"{k}={v:g}" for k, v in split.items()))
+    return {**overrides, **split}
+
+def work(q: WorkQueue, out: Path, procs: int, overrides: dict, profile: bool = False):
+    if any(t["payload"]["source"] == "careerly" for t in q.tasks("queued")):
+        apply(overrides)
+        asyncio.run(login_careerly())
+
+    overrides = split_qps(procs, overrides)
+
+    if procs == 1:
+        worker(str(q.path), str(out), overrides, profile)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    ps = [ctx.Process(target=worker, args=(str(q.path), str(out), overrides, profile)) for _ in range(procs)]
+    for p in ps:
+        p.start()
+    for p in ps:
+        p.join()
+
+def read_records(path: Path):
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+def header(path: Path) -> list:
+    for rec in read_records(path):
+        return list(rec.keys())
+    return []
+
+def merge(q: WorkQueue, out_dir: Path) -> list:
+    groups = {}
+    for t in q.tasks("done"):
+        src = t["payload"]["source"]
+        for name in t["result"]["files"]:
+            ds, key = next(d for d in DATASETS[src] if name.startswith(d[0] + "_"))
+            g = groups.setdefault(ds, {"key": key, "files": [], "start": [], "end": []})
+            g["files"].append((t["payload"]["start"], t["id"], Path(t["result"]["dir"]) / name))
+            g["start"].append(t["payload"]["start"])
+            g["end"].append(t["payload"]["end"])
+
+    pending = [t for t in q.tasks() if t["state"] != "done"]
+    if pending:
+        print(f"[merge] 경고: 끝나지 않은 샤드 {len(pending)}개는 제외됩니다")
+        for t in pending:
+            print(f"  {t['shard']} {t['state']} {t['error'] or ''}")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for ds, g in sorted(groups.items()):
+        files = [f for _, _, f in sorted(g["files"])]
+        cols = list(dict.fromkeys(c for f in files for c in header(f)))
+        ext = files[0].suffix
+        path = out_dir / f"{ds}_{min(g['start'])}_to_{max(g['end'])}_merged_{TODAY}{ext}"
+        with RecordSink(path, cols, key=g["key"]) as sink:
+            for f in files:
+                for rec in read_records(f):
+                    sink.write(rec)
+        print(f"[merge] {path} {sink.count}건 (샤드 {len(files)}개, 중복 {sink.dupes}건)")
+        if sink.count:
+            paths.append(path)
+    return paths
+
+def status(q: WorkQueue):
+    counts = q.counts()
+    print("[shard] " + " ".join(f"{k}={counts.get(k, 0)}" for k in ("queued", "leased", "done", "failed")))
+    for t in q.tasks():
+        if t["state"] in ("leased", "failed"):
+            print(f"  {t['shard']} {t['state']} 시도={t['attempts']} {t['worker'] or ''} {t['error'] or ''}")
+
+def main():
+    ap = argparse.ArgumentParser(description="기간/카테고리 샤드를 여러 프로세스(또는 여러 서버)에서 나눠 수집")
+    ap.add_argument("command", choices=["plan", "work", "merge", "status", "requeue", "run"])
+    ap.add_argument("sources", nargs="*", help=f"{', '.join(SOURCES)} (plan/run, 기본: 전체)")
+    ap.add_argument("--queue", type=Path, help="작업 큐 SQLite (기본 ./.crawl_state/queue.sqlite)")
+    ap.add_argument("--shard-dir", type=Path, default=SHARD_DIR, help="샤드별 결과/체크포인트 폴더")
+    ap.add_argument("--out-dir", type=Path, default=OUTPUT_DIR, help="합친 결과 저장 폴더")
+    ap.add_argument("--window", action="append", default=[], help="YYYY-MM-DD~YYYY-MM-DD (여러 번 지정 가능)")
+    ap.add_argument("--range", help="YYYY-MM-DD~YYYY-MM-DD 를 --step 단위로 분할")
+    ap.add_argument("--step", default="month", help="month 또는 일수 (기본 month)")
+    ap.add_argument("--procs", type=int, default=os.cpu_count() or 1, help="워커 프로세스 수")
+    ap.add_argument("--set", nargs="*", default=[], metavar="MODULE.NAME=VALUE")
+    ap.add_argument("--profile", action="store_true", help="워커별 trace/CPU 프로파일 저장 (./.crawl_profile)")
+    args = ap.parse_args()
+
+    overrides = dict(o.split("=", 1) for o in args.set)
+    if args.command in ("work", "run"):
+        bad = bad_formats(SOURCES, overrides)
+        if bad:
+            ap.error(f"shard.py 는 {'/'.join(FORMATS)} 출력만 합칠 수 있음: {', '.join(bad)}")
+    q = WorkQueue(args.queue)
+    t0 = time.time()
+
+    if args.command in ("plan", "run"):
+        sources = args.sources or SOURCES
+        unknown = [s for s in sources if s not in SOURCES]
+        if unknown:
+            ap.error(f"알 수 없는 소스: {', '.join(unknown)}")
+        windows = [parse_window(w) for w in args.window]
+        if args.range:
+            windows += split_range(*parse_window(args.range), args.step)
+        if not windows:
+            ap.error("--window 또는 --range 로 기간을 지정하세요")
+        print(f"[shard] 새 샤드 {plan(q, sources, windows)}개 추가 ({q.path})")
+    if args.command in ("work", "run"):
+        work(q, args.shard_dir, max(1, args.procs), overrides, args.profile)
+    if args.command in ("merge", "run"):
+        merge(q, args.out_dir)
+    if args.command == "requeue":
+        print(f"[shard] 실패 샤드 {q.requeue()}개 다시 대기")
+    status(q)
+    q.close()
+    print("elapsed_min:", round((time.time() - t0) / 60, 2))
+
+if __name__ == "__main__":
+    main()
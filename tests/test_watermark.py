@@ -0,0 +1,36 @@
+from crawlcore.watermark import Watermarks
+
+def test_failed_window_then_successful_window(tmp_path):
+    wm = Watermarks("t", state_dir=tmp_path)
+    wm.begin(True)
+    wm.advance("life", [{"id": "10"}], "id")
+    wm.save()
+
+    wm.begin(True)
+    wm.advance("life", [{"id": "20"}], "id")
+    wm.hold()
+    assert wm.mark("life") == 10
+    assert wm.held_keys() == ["전체"]
+
+    wm.begin(True)
+    assert wm.held_keys() == []
+    wm.advance("life", [{"id": "30"}], "id")
+    wm.save()
+    assert wm.mark("life") == 30
+    assert Watermarks("t", state_dir=tmp_path).mark("life") == 30
+
+def test_held_key_only_blocks_its_own_window(tmp_path):
+    wm = Watermarks("t", state_dir=tmp_path)
+    wm.begin(True)
+    wm.advance("qna", [{"id": "5"}], "id")
+    wm.hold("qna")
+    wm.advance("qna", [{"id": "6"}], "id")
+    wm.advance("life", [{"id": "7"}], "id")
+    wm.save()
+    assert wm.held_keys() == ["qna"]
+    assert Watermarks("t", state_dir=tmp_path).marks == {"life": {"id": 7, "created_at": ""}}
+
+    wm.begin(True)
+    wm.advance("qna", [{"id": "8"}], "id")
+    wm.save()
+    assert wm.mark("qna") == 8